@@ -5,7 +5,8 @@ import warnings
 warnings.simplefilter("always", ImportWarning)
 
 try:
-    from .compute import compute
+    from . import parallel
+    from .compute import Crossbar, compute, compute_batch, compute_stream
 except ModuleNotFoundError as e:
     warnings.warn(f"Could not import `badcrossbar.compute()` ({e})", ImportWarning)
 
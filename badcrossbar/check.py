@@ -5,43 +5,249 @@ import numpy.typing as npt
 
 from badcrossbar import utils
 
+# types of single numbers, checked with `isinstance()` because it is much
+# cheaper than converting the values to arrays.
+NUMBER_TYPES = (int, float, np.integer, np.floating)
+
 
 def crossbar_requirements(
     resistances: npt.ArrayLike,
     applied_voltages: npt.ArrayLike,
     r_i_word_line,
     r_i_bit_line,
+    validate: bool = True,
     **kwargs,
 ) -> tuple[npt.NDArray, npt.NDArray]:
     """Checks if crossbar variables satisfy all requirements.
 
+    The arrays are not copied, and the values of the resistances are scanned
+    only once. The checks that need the whole array of resistances are only
+    repeated if that single scan finds a problem, which keeps the overhead
+    low for small crossbars.
+
     Args:
         resistances: Resistances of crossbar devices.
         applied_voltages: Applied voltages.
         r_i_word_line: Interconnect resistance of the word line segments.
         r_i_bit_line: Interconnect resistance of the bit line segments.
+        validate: If False, the inputs are trusted and only converted to
+            arrays.
 
     Returns:
         Potentially modified resistances and applied voltages.
     """
+    resistances = np.asarray(resistances)
+    applied_voltages = np.asarray(applied_voltages)
+    if not validate:
+        return resistances, applied_voltages
+
+    n_dimensional(resistances, [2], "resistances")
+    numeric_array(resistances, "resistances")
+    non_empty(resistances, "resistances")
+    # a single reduction is enough to find both negative and zero resistances.
+    minimum = resistances.min()
+    if minimum < 0:
+        non_negative_array(resistances, "resistances")
+
+    interconnect_requirements(r_i_word_line, r_i_bit_line, resistances.shape)
+    if minimum == 0:
+        short_circuit(resistances, r_i_word_line, r_i_bit_line)
+
+    n_dimensional(applied_voltages, [2], "applied_voltages")
+    numeric_array(applied_voltages, "applied_voltages")
+    non_empty(applied_voltages, "applied_voltages")
+    match_shape(resistances=(resistances, 0), applied_voltages=(applied_voltages, 0))
+
+    return resistances, applied_voltages
+
+
+def resistance_requirements(
+    resistances: npt.ArrayLike, r_i_word_line, r_i_bit_line, **kwargs
+) -> npt.NDArray:
+    """Checks if device and interconnect resistances satisfy all requirements.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+
+    Returns:
+        Potentially modified resistances.
+    """
+    resistances = np.array(resistances)
+    n_dimensional(resistances, [2], "resistances")
+    numeric_array(resistances, "resistances")
+    non_empty(resistances, "resistances")
+    non_negative_array(resistances, "resistances")
+
+    interconnect_requirements(r_i_word_line, r_i_bit_line, resistances.shape)
+    short_circuit(resistances, r_i_word_line, r_i_bit_line)
+
+    return resistances
+
+
+def voltage_requirements(
+    applied_voltages: npt.ArrayLike, resistances: npt.NDArray, validate: bool = True, **kwargs
+) -> npt.NDArray:
+    """Checks if applied voltages satisfy all requirements.
+
+    Args:
+        applied_voltages: Applied voltages.
+        resistances: Resistances of crossbar devices that have already been
+            checked.
+        validate: If False, the applied voltages are trusted and only
+            converted to an array.
+
+    Returns:
+        Potentially modified applied voltages.
+    """
+    applied_voltages = np.asarray(applied_voltages)
+    if not validate:
+        return applied_voltages
+    n_dimensional(applied_voltages, [2], "applied_voltages")
+    numeric_array(applied_voltages, "applied_voltages")
+    non_empty(applied_voltages, "applied_voltages")
+    match_shape(resistances=(resistances, 0), applied_voltages=(applied_voltages, 0))
+
+    return applied_voltages
+
+
+def batch_requirements(
+    resistances: npt.ArrayLike,
+    applied_voltages: npt.ArrayLike,
+    r_i_word_line,
+    r_i_bit_line,
+    **kwargs,
+) -> tuple[npt.NDArray, npt.NDArray]:
+    """Checks if variables of multiple crossbars satisfy all requirements.
+
+    Args:
+        resistances: Resistances of crossbar devices of shape `k x m x n`.
+        applied_voltages: Applied voltages of shape `k x m x p`, or of shape
+            `m x p` if the same voltages are applied to all crossbars.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+
+    Returns:
+        Potentially modified resistances and applied voltages, the latter
+        always of shape `k x m x p`.
+    """
     resistances, applied_voltages = (np.array(i) for i in (resistances, applied_voltages))
+    n_dimensional(resistances, [3], "resistances")
+    n_dimensional(applied_voltages, [2, 3], "applied_voltages")
     for value, name in ((resistances, "resistances"), (applied_voltages, "applied_voltages")):
-        n_dimensional(value, [2], name)
         numeric_array(value, name)
         non_empty(value, name)
 
     non_negative_array(resistances, "resistances")
+    if applied_voltages.ndim == 2:
+        applied_voltages = np.broadcast_to(
+            applied_voltages, (resistances.shape[0],) + applied_voltages.shape
+        )
     match_shape(resistances=(resistances, 0), applied_voltages=(applied_voltages, 0))
+    match_shape(resistances=(resistances, 1), applied_voltages=(applied_voltages, 1))
+
+    interconnect_requirements(r_i_word_line, r_i_bit_line, resistances.shape[1:])
+    short_circuit(resistances, r_i_word_line, r_i_bit_line)
+
+    return resistances, applied_voltages
+
+
+def interconnect_requirements(r_i_word_line, r_i_bit_line, shape: tuple[int, int]):
+    """Checks if interconnect resistances satisfy all requirements.
+
+    Each of them can either be a single non-negative number or an array of
+    positive resistances of the individual segments.
 
+    Args:
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+        shape: Shape of the array of crossbar devices.
+    """
+    if isinstance(r_i_word_line, NUMBER_TYPES) and isinstance(r_i_bit_line, NUMBER_TYPES):
+        # cheap path for the common case of single resistances.
+        same = r_i_word_line == r_i_bit_line
+        non_negative_number(r_i_word_line, "r_i" if same else "r_i_word_line")
+        non_negative_number(r_i_bit_line, "r_i" if same else "r_i_bit_line")
+        return
+
+    same = np.ndim(r_i_word_line) == np.ndim(r_i_bit_line) == 0 and r_i_word_line == r_i_bit_line
     for value, name in ((r_i_word_line, "r_i_word_line"), (r_i_bit_line, "r_i_bit_line")):
-        if r_i_word_line == r_i_bit_line:
+        if same:
             name = "r_i"
-        number(value, name)
-        non_negative_number(value, name)
+        if np.ndim(value) == 0:
+            number(value, name)
+            non_negative_number(value, name)
+        else:
+            array = np.asarray(value)
+            n_dimensional(array, [2], name)
+            numeric_array(array, name)
+            if array.shape != tuple(shape):
+                raise ValueError(
+                    f'Shape {array.shape} of array "{name}" should match the shape {tuple(shape)} of '
+                    f'array "resistances"!'
+                )
+            positive_array(array, name)
+            non_infinite_array(array, name)
+
+
+def line_end_requirements(
+    r_i_word_line,
+    r_i_bit_line,
+    shape: tuple[int, int],
+    r_source=None,
+    r_sink=None,
+    dtype: npt.DTypeLike = float,
+):
+    """Checks source and sink resistances and adds them to the interconnect
+    segments at the ends of the lines.
+
+    The source resistance is in series with the first segment of each word
+    line, while the sink resistance is in series with the last segment of each
+    bit line.
 
-    short_circuit(resistances, r_i_word_line, r_i_bit_line)
+    Args:
+        r_i_word_line: Interconnect resistance of the word line segments that
+            has already been checked.
+        r_i_bit_line: Interconnect resistance of the bit line segments that
+            has already been checked.
+        shape: Shape of the array of crossbar devices.
+        r_source: Resistance between the voltage source and each word line,
+            either a single number or an array of length `m`.
+        r_sink: Resistance between each bit line and the ground, either a
+            single number or an array of length `n`.
+        dtype: Floating-point type of the returned resistances.
 
-    return resistances, applied_voltages
+    Returns:
+        Potentially modified interconnect resistances of the word and bit
+        line segments.
+
+    Raises:
+        ValueError: If a line with zero interconnect resistance has non-zero
+            resistance at its end.
+    """
+    r_i = []
+    for r, r_end, name, line, index in (
+        (r_i_word_line, r_source, "r_source", "word", (slice(None), 0)),
+        (r_i_bit_line, r_sink, "r_sink", "bit", (-1, slice(None))),
+    ):
+        if r_end is not None:
+            array = np.asarray(r_end, dtype=float)
+            n_dimensional(array, [0, 1], name)
+            non_negative_array(array, name)
+            if np.any(array > 0):
+                if not np.all(np.greater(r, 0)):
+                    raise ValueError(
+                        f'"{name}" is not supported when the {line} lines have zero interconnect '
+                        f"resistance!"
+                    )
+                r = np.array(np.broadcast_to(r, shape), dtype=dtype)
+                r[index] += array
+        # single resistances become NumPy scalars so that they do not promote
+        # single-precision arrays.
+        r = np.asarray(r, dtype=dtype)
+        r_i.append(r[()] if r.ndim == 0 else r)
+    return tuple(r_i)
 
 
 def plotting_requirements(
@@ -128,6 +334,25 @@ def not_none(**kwargs: Any) -> dict[str, Any]:
     return valid_items
 
 
+def supported_options(options: dict[str, Any], supported: tuple[str, ...], name: str):
+    """Checks that only supported keyword arguments were passed.
+
+    Args:
+        options: Keyword arguments.
+        supported: Names of the supported keyword arguments.
+        name: Name of the function that the keyword arguments were passed to.
+
+    Raises:
+        TypeError: If any of the keyword arguments are not supported.
+    """
+    unsupported = [key for key in options if key not in supported]
+    if unsupported:
+        raise TypeError(
+            f"{name}() does not support keyword argument(s) {', '.join(unsupported)}! "
+            f"Supported keyword arguments are {', '.join(supported)}."
+        )
+
+
 def n_dimensional(array: npt.NDArray, n_list: list[int] = [2], name: str = "array"):
     """Checks that array is `n`-dimensional.
 
@@ -221,6 +446,20 @@ def non_negative_array(array: npt.NDArray, name: str = "array"):
         raise ValueError(f'"{name}" array contains at least one negative value!')
 
 
+def positive_array(array: npt.NDArray, name: str = "array"):
+    """Checks if all the elements of the array are positive.
+
+    Args:
+        array: Array.
+        name: Name of the array.
+
+    Raises:
+        ValueError: If the array contains non-positive values.
+    """
+    if (array <= 0).any():
+        raise ValueError(f'"{name}" array contains at least one non-positive value!')
+
+
 def non_infinite_array(array: npt.NDArray, name: str = "array"):
     """Checks if all the elements of the array are non-infinite.
 
@@ -243,9 +482,10 @@ def number(value: Any, name: str = "variable"):
         name: Name of the variable.
 
     Raises:
-        TypeError: If the variable is not int or float.
+        TypeError: If the variable is not int or float (including NumPy
+            scalars, e.g. `np.float32`).
     """
-    if not isinstance(value, (int, float)):
+    if not isinstance(value, NUMBER_TYPES):
         raise TypeError(
             f'Type {type(value).__name__} of "{name}" is not supported. Use int or float instead.'
         )
@@ -281,7 +521,7 @@ def short_circuit(resistances: npt.NDArray, r_i_word_line: float, r_i_bit_line:
     """
 
     if 0 in resistances:
-        if r_i_word_line == r_i_bit_line == 0:
+        if not np.any(r_i_word_line) and not np.any(r_i_bit_line):
             err_txt = "At least some crossbar devices have zero resistance causing short circuit!"
         else:
             err_txt = (
@@ -1,5 +1,8 @@
 import logging
+from collections.abc import Iterable, Iterator
+from typing import Callable, Optional
 
+import numpy as np
 import numpy.typing as npt
 
 from badcrossbar import check, computing
@@ -13,7 +16,7 @@ def compute(
     r_i: float = None,
     r_i_word_line: float = None,
     r_i_bit_line: float = None,
-    **kwargs
+    **kwargs,
 ) -> computing.Solution:
     """Computes branch currents and node voltages of a crossbar.
 
@@ -28,10 +31,89 @@ def compute(
         r_i: Interconnect resistance of the word and bit line segments. If None,
             `r_i_word_line` and `r_i_bit_line` are used instead.
         r_i_word_line: Interconnect resistance of the word line segments.
+            Either a single number or an array of shape `m x n` containing the
+            resistance of each segment; element `(i, j)` is the resistance of
+            the segment between node `(i, j)` and the one on its left (or the
+            voltage source if `j == 0`).
         r_i_bit_line: Interconnect resistance of the bit line segments.
+            Either a single number or an array of shape `m x n`; element
+            `(i, j)` is the resistance of the segment between node `(i, j)`
+            and the one below it (or the ground if `i == m-1`).
         **node_voltages: If False, None is returned instead of node voltages.
         **all_currents: If False, only output currents are returned, while all
             the other ones are set to None.
+        **r_source: Output resistance of the voltage sources, either a single
+            number or an array of length `m`. It is added to the first segment
+            of each word line.
+        **r_sink: Input resistance of the circuits sensing the output
+            currents, either a single number or an array of length `n`. It is
+            added to the last segment of each bit line.
+        **solver: Method used to solve the system of nodal equations. One of
+            {`"direct"`, `"cg"`, `"minres"`, `"schur"`}. Iterative methods
+            (`"cg"` and `"minres"`) require much less memory for large
+            crossbars, at the expense of accuracy. `"schur"` eliminates the
+            nodes on the bit lines and solves the remaining system of half
+            the size iteratively. The number of iterations and the residual
+            of each example are logged and stored in attribute `info` of the
+            returned solution.
+        **tol: Relative tolerance of the residual when using an iterative
+            solver.
+        **maxiter: Maximum number of iterations per example when using an
+            iterative solver.
+        **preconditioner: Preconditioner used by the iterative solvers. One of
+            {`"line"`, `"jacobi"`, `"ilu"`}, None or a
+            `scipy.sparse.linalg.LinearOperator`. The default, `"line"`, solves
+            the tridiagonal systems of all word and bit lines at once.
+        **device_current: Function describing nonlinear current-voltage
+            characteristic of the devices. It is passed an array of voltages
+            across the devices of shape `m x n x p` and `resistances` of shape
+            `m x n x 1`, and must return the currents flowing through the
+            devices. If passed, the nodal equations are solved using Newton's
+            method, and the options of the linear solvers are ignored.
+        **device_conductance: Derivative of `device_current` with respect to
+            the voltage, with the same signature.
+        **newton_tol: Maximum change of node voltages (in volts) between the
+            last two Newton iterations for the solution to be accepted.
+            Defaults to 1e-9, but is never smaller than the rounding error of
+            `dtype`.
+        **newton_maxiter: Maximum number of Newton iterations. Defaults to 50.
+            The number of iterations and the maximum change of node voltages
+            in the last iteration of each example are stored in attribute
+            `info` of the returned solution; examples whose change is larger
+            than `newton_tol` have not converged.
+        **block_size: If passed, the system of nodal equations is factorized
+            once and solved for blocks of this many examples at a time, which
+            bounds the memory taken by the intermediate arrays of the solver.
+        **workers: Number of threads solving for different blocks of examples
+            concurrently. Only used if `block_size` is passed.
+        **validate: If False, the inputs are not checked, which saves time
+            when simulating many small crossbars whose inputs are known to be
+            valid. Defaults to True.
+        **dtype: Floating-point type of the computations and of the returned
+            arrays, e.g. `np.float32` to halve the memory usage. Arrays that
+            already have this type are used without being copied. Defaults
+            to `np.float64`.
+        **out: Named tuple `badcrossbar.computing.Currents` whose fields
+            `device`, `word_line` and `bit_line` (the others are ignored) are
+            arrays that the corresponding currents are written to instead of
+            newly allocated ones, or Nones. Each array must have the shape of
+            the returned one (`m x n` if `p == 1`, or `m x n x p` if `p > 1`)
+            and type `dtype`. Some buffers are not used, e.g. with insulating
+            interconnects, so the returned arrays should be read instead.
+            Ignored if `memory_limit` or `output_dir` is passed.
+        **lazy: If True, branch currents and node voltages are only extracted
+            from the solution of the nodal equations when they are first
+            accessed, so fields that are never read cost nothing.
+        **memory_limit: If passed, the examples are split into chunks whose
+            intermediate arrays are estimated to take at most this many
+            bytes. Each chunk is solved for and extracted in turn into arrays
+            allocated in advance, reusing the same factorization. Ignores
+            `lazy`.
+        **output_dir: If passed, the returned arrays are memory-mapped `.npy`
+            files in this directory (e.g. `device_currents.npy`), written
+            chunk by chunk, so that the results do not have to fit into
+            memory. The directory is created if it does not exist. Use
+            together with `memory_limit`.
 
     Returns:
         Branch currents and node voltages of the crossbar. Field `currents`
@@ -51,13 +133,416 @@ def compute(
         r_i_word_line = r_i_bit_line = r_i
 
     resistances, applied_voltages = check.crossbar_requirements(
-        resistances, applied_voltages, r_i_word_line, r_i_bit_line
+        resistances,
+        applied_voltages,
+        r_i_word_line,
+        r_i_bit_line,
+        validate=kwargs.pop("validate", True),
+    )
+    dtype = kwargs.pop("dtype", np.float64)
+    resistances = np.asarray(resistances, dtype=dtype)
+    applied_voltages = np.asarray(applied_voltages, dtype=dtype)
+    r_i_word_line, r_i_bit_line = check.line_end_requirements(
+        r_i_word_line,
+        r_i_bit_line,
+        resistances.shape,
+        kwargs.pop("r_source", None),
+        kwargs.pop("r_sink", None),
+        dtype=dtype,
     )
 
     logger.info("Initialising simulation.")
 
+    memory_limit = kwargs.pop("memory_limit", None)
+    if memory_limit is not None or kwargs.get("output_dir") is not None:
+        return computing.extract.chunked_solution(
+            resistances, r_i_word_line, r_i_bit_line, applied_voltages, memory_limit, **kwargs
+        )
+
     solution = computing.extract.solution(
         resistances, r_i_word_line, r_i_bit_line, applied_voltages, **kwargs
     )
 
     return solution
+
+
+def compute_batch(
+    applied_voltages: npt.ArrayLike,
+    resistances: npt.ArrayLike,
+    r_i: float = None,
+    r_i_word_line: float = None,
+    r_i_bit_line: float = None,
+    **kwargs,
+) -> computing.Solution:
+    """Computes branch currents and node voltages of multiple crossbars of the
+    same shape.
+
+    The inputs are validated once and, if both interconnect resistances are
+    non-zero, the nodal equations of all the crossbars are solved as a single
+    block-diagonal system sharing one sparsity pattern.
+
+    Args:
+        applied_voltages: Applied voltages. Voltages must be supplied in an
+            array of shape `k x m x p`, where `k` is the number of crossbars,
+            `m` is the number of word lines and `p` is the number of examples.
+            If an array of shape `m x p` is supplied, the same voltages are
+            applied to all the crossbars.
+        resistances: Resistances of crossbar devices. Resistances must be
+            supplied in an array of shape `k x m x n`, where `n` is the number
+            of bit lines.
+        r_i: Interconnect resistance of the word and bit line segments. If None,
+            `r_i_word_line` and `r_i_bit_line` are used instead.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+        **node_voltages: If False, None is returned instead of node voltages.
+        **all_currents: If False, only output currents are returned, while all
+            the other ones are set to None.
+        **r_source: Output resistance of the voltage sources, as in
+            `compute()`.
+        **r_sink: Input resistance of the output circuits, as in `compute()`.
+        **dtype: Floating-point type of the computations and of the returned
+            arrays. Defaults to `np.float64`.
+
+    Returns:
+        Branch currents and node voltages of the crossbars in the same format
+        as returned by `compute()`, except that each array has an additional
+        leading axis of length `k`.
+
+    Raises:
+        TypeError: If any other keyword arguments of `compute()` (e.g. the
+            options of the solvers) are passed.
+    """
+    check.supported_options(
+        kwargs, ("node_voltages", "all_currents", "r_source", "r_sink", "dtype"), "compute_batch"
+    )
+    kwargs.setdefault("node_voltages", True)
+    kwargs.setdefault("all_currents", True)
+
+    if r_i is not None:
+        r_i_word_line = r_i_bit_line = r_i
+
+    resistances, applied_voltages = check.batch_requirements(
+        resistances, applied_voltages, r_i_word_line, r_i_bit_line
+    )
+    dtype = kwargs.pop("dtype", np.float64)
+    resistances = np.asarray(resistances, dtype=dtype)
+    applied_voltages = np.asarray(applied_voltages, dtype=dtype)
+    r_i_word_line, r_i_bit_line = check.line_end_requirements(
+        r_i_word_line,
+        r_i_bit_line,
+        resistances.shape[1:],
+        kwargs.pop("r_source", None),
+        kwargs.pop("r_sink", None),
+        dtype=dtype,
+    )
+
+    logger.info(f"Initialising simulation of {resistances.shape[0]} crossbars.")
+
+    solution = computing.extract.batch_solution(
+        resistances, r_i_word_line, r_i_bit_line, applied_voltages, **kwargs
+    )
+
+    return solution
+
+
+def compute_stream(
+    applied_voltages: Iterable[npt.ArrayLike],
+    resistances: npt.ArrayLike,
+    r_i: float = None,
+    r_i_word_line: float = None,
+    r_i_bit_line: float = None,
+    **kwargs,
+) -> Iterator[computing.Solution]:
+    """Computes branch currents and node voltages of a crossbar for a stream
+    of applied voltages.
+
+    The system of nodal equations is factorized once, and the chunks of
+    applied voltages are only read as the solutions are consumed, so memory
+    usage is bounded by the size of a single chunk.
+
+    Args:
+        applied_voltages: Iterable of arrays of applied voltages, each of
+            shape `m x p_k`, where `p_k` is the number of examples in chunk
+            `k`.
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistance of the word and bit line segments. If None,
+            `r_i_word_line` and `r_i_bit_line` are used instead.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+        **node_voltages: If False, None is returned instead of node voltages.
+        **all_currents: If False, only output currents are returned, while all
+            the other ones are set to None.
+        **kwargs: Other keyword arguments of `Crossbar` (e.g. `solver` or
+            `dtype`) and of `Crossbar.apply()`.
+
+    Returns:
+        Iterator over branch currents and node voltages of the crossbar for
+        each chunk, in the same format as returned by `compute()`.
+    """
+    crossbar_kwargs = {
+        key: kwargs.pop(key)
+        for key in ("solver", "tol", "maxiter", "preconditioner", "r_source", "r_sink", "dtype")
+        if key in kwargs
+    }
+    crossbar = Crossbar(resistances, r_i, r_i_word_line, r_i_bit_line, **crossbar_kwargs)
+    return crossbar.stream(applied_voltages, **kwargs)
+
+
+class Crossbar:
+    """Crossbar array with fixed device and interconnect resistances.
+
+    Matrix `g` is assembled and factorized once when the object is created.
+    Branch currents and node voltages can then be computed for any number of
+    applied voltages, each time only performing forward and backward
+    substitution.
+
+    Args:
+        resistances: Resistances of crossbar devices. Resistances must be
+            supplied in an array of shape `m x n`, where `m` is the number of
+            word lines and `n` is the number of bit lines.
+        r_i: Interconnect resistance of the word and bit line segments. If None,
+            `r_i_word_line` and `r_i_bit_line` are used instead.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+        **solver: Method used to solve the system of nodal equations. One of
+            {`"direct"`, `"cg"`, `"minres"`, `"schur"`}. If an iterative method
+            is chosen, only the preconditioner is computed in advance.
+        **tol: Relative tolerance of the residual when using an iterative
+            solver.
+        **maxiter: Maximum number of iterations per example when using an
+            iterative solver.
+        **preconditioner: Preconditioner used by the iterative solvers.
+        **r_source: Output resistance of the voltage sources, as in
+            `compute()`.
+        **r_sink: Input resistance of the output circuits, as in `compute()`.
+        **dtype: Floating-point type of the computations and of the returned
+            arrays. Applied voltages are converted to it. Defaults to
+            `np.float64`.
+    """
+
+    def __init__(
+        self,
+        resistances: npt.ArrayLike,
+        r_i: float = None,
+        r_i_word_line: float = None,
+        r_i_bit_line: float = None,
+        **kwargs,
+    ):
+        if r_i is not None:
+            r_i_word_line = r_i_bit_line = r_i
+
+        self.dtype = np.dtype(kwargs.pop("dtype", np.float64))
+        self.resistances = np.asarray(
+            check.resistance_requirements(resistances, r_i_word_line, r_i_bit_line),
+            dtype=self.dtype,
+        )
+        self.r_i = computing.extract.Interconnect(
+            *check.line_end_requirements(
+                r_i_word_line,
+                r_i_bit_line,
+                self.resistances.shape,
+                kwargs.pop("r_source", None),
+                kwargs.pop("r_sink", None),
+                dtype=self.dtype,
+            )
+        )
+
+        logger.info("Initialising crossbar.")
+        self._kwargs = kwargs
+        self._factorization = computing.solve.factorize(self.resistances, self.r_i, **kwargs)
+        self._effective_conductances = None
+        # resistances and factorization that low-rank updates are relative to.
+        self._base = (self.resistances, self._factorization)
+
+    @property
+    def effective_conductances(self) -> npt.NDArray:
+        """Matrix `W` of shape `m x n` such that the output currents are
+        equal to `V^T W`, where `V` are the applied voltages.
+
+        It is computed on first access and cached.
+        """
+        if self._effective_conductances is None:
+            logger.info("Started computing effective conductances.")
+            self._effective_conductances = computing.extract.effective_conductances(
+                self.resistances, self.r_i, factorization=self._factorization
+            )
+            logger.info("Computed effective conductances.")
+        return self._effective_conductances
+
+    @property
+    def info(self) -> Optional[computing.iterative.SolverInfo]:
+        """Statistics of the last call to the iterative solver.
+
+        Named tuple with fields `iterations` and `residuals`, each containing
+        one value per example. None if a direct solver is used.
+        """
+        return getattr(self._factorization, "info", None)
+
+    def apply(self, applied_voltages: npt.ArrayLike, **kwargs) -> computing.Solution:
+        """Computes branch currents and node voltages of the crossbar.
+
+        Args:
+            applied_voltages: Applied voltages. Voltages must be supplied in
+                an array of shape `m x p`, where `p` is the number of examples
+                (sets of voltages applied one by one).
+            **node_voltages: If False, None is returned instead of node
+                voltages.
+            **all_currents: If False, only output currents are returned, while
+                all the other ones are set to None.
+            **block_size: If passed, examples are solved for in blocks of
+                this many columns of `applied_voltages`.
+            **workers: Number of threads solving for different blocks of
+                examples concurrently.
+            **validate: If False, the applied voltages are not checked.
+            **out: Buffers that the branch currents are written to, as in
+                `compute()`. They must have type `dtype` of the crossbar.
+            **lazy: If True, branch currents and node voltages are only
+                extracted when they are first accessed.
+            **memory_limit: If passed, the examples are solved for in chunks
+                whose intermediate arrays take at most this many bytes.
+            **output_dir: If passed, the returned arrays are memory-mapped
+                `.npy` files in this directory.
+
+        Returns:
+            Branch currents and node voltages of the crossbar in the same
+            format as returned by `compute()`.
+
+        Raises:
+            TypeError: If `dtype` is passed; it is set when the crossbar is
+                created.
+        """
+        if "dtype" in kwargs:
+            raise TypeError(
+                "Crossbar.apply() does not accept dtype! Pass it to Crossbar() instead."
+            )
+        kwargs.setdefault("node_voltages", True)
+        kwargs.setdefault("all_currents", True)
+
+        applied_voltages = check.voltage_requirements(
+            applied_voltages, self.resistances, validate=kwargs.pop("validate", True)
+        )
+        applied_voltages = np.asarray(applied_voltages, dtype=self.dtype)
+
+        memory_limit = kwargs.pop("memory_limit", None)
+        if memory_limit is not None or kwargs.get("output_dir") is not None:
+            return computing.extract.chunked_solution(
+                self.resistances,
+                self.r_i.word_line,
+                self.r_i.bit_line,
+                applied_voltages,
+                memory_limit,
+                factorization=self._factorization,
+                **kwargs,
+            )
+
+        solution = computing.extract.solution(
+            self.resistances,
+            self.r_i.word_line,
+            self.r_i.bit_line,
+            applied_voltages,
+            factorization=self._factorization,
+            **kwargs,
+        )
+
+        return solution
+
+    def update(self, indices, resistances: npt.ArrayLike, max_rank: int = 64):
+        """Changes resistances of some of the devices.
+
+        If a direct solver is used, the factorization of `g` is corrected
+        using Sherman-Morrison-Woodbury formula, which requires one solve per
+        device that differs from the last full factorization. If more than
+        `max_rank` devices differ (or an iterative solver is used), `g` is
+        factorized again.
+
+        Args:
+            indices: Indices of the devices in any form supported by NumPy
+                indexing, e.g. a tuple of arrays of row and column indices.
+            resistances: New resistances of the devices.
+            max_rank: Maximum number of changed devices for which the
+                factorization is updated instead of being recomputed.
+        """
+        new_resistances = self.resistances.copy()
+        new_resistances[indices] = resistances
+        new_resistances = check.resistance_requirements(
+            new_resistances, self.r_i.word_line, self.r_i.bit_line
+        )
+
+        base_resistances, base_factorization = self._base
+        num_changes = np.count_nonzero(new_resistances != base_resistances)
+        if base_factorization is None or num_changes == 0:
+            self._factorization = base_factorization
+        elif num_changes <= max_rank and not isinstance(
+            base_factorization,
+            (computing.iterative.IterativeSolver, computing.schur.SchurSolver),
+        ):
+            self._factorization = computing.woodbury.LowRankFactorization(
+                base_factorization, base_resistances, new_resistances, self.r_i
+            )
+        else:
+            logger.info(f"{num_changes} device(s) changed; factorizing g again.")
+            self._factorization = computing.solve.factorize(
+                new_resistances, self.r_i, **self._kwargs
+            )
+            self._base = (new_resistances, self._factorization)
+
+        self.resistances = new_resistances
+        self._effective_conductances = None
+
+    def output_currents(self, applied_voltages: npt.ArrayLike) -> npt.NDArray:
+        """Computes output currents using the effective conductances.
+
+        After the first call, no system of equations is solved, so this is
+        much faster than `apply()` when only the outputs are needed.
+
+        Args:
+            applied_voltages: Applied voltages of shape `m x p`.
+
+        Returns:
+            Output currents of shape `p x n`.
+        """
+        applied_voltages = check.voltage_requirements(applied_voltages, self.resistances)
+        applied_voltages = np.asarray(applied_voltages, dtype=self.dtype)
+        return applied_voltages.T @ self.effective_conductances
+
+    def vjp(self, applied_voltages: npt.ArrayLike) -> tuple[npt.NDArray, Callable]:
+        """Computes output currents and the vector-Jacobian product function
+        of the crossbar.
+
+        The function reuses the factorization of the crossbar, so each call
+        requires a single additional solve, regardless of the number of
+        devices.
+
+        Args:
+            applied_voltages: Applied voltages of shape `m x p`.
+
+        Returns:
+            Output currents of shape `p x n` and a function that, given the
+            gradients of a scalar with respect to the output currents (of
+            shape `p x n`), returns its gradients with respect to the
+            resistances (of shape `m x n`) and applied voltages (of shape
+            `m x p`).
+        """
+        applied_voltages = check.voltage_requirements(applied_voltages, self.resistances)
+        applied_voltages = np.asarray(applied_voltages, dtype=self.dtype)
+        return computing.adjoint.vjp(
+            self.resistances, self.r_i, applied_voltages, factorization=self._factorization
+        )
+
+    def stream(
+        self, applied_voltages: Iterable[npt.ArrayLike], **kwargs
+    ) -> Iterator[computing.Solution]:
+        """Computes branch currents and node voltages of the crossbar for
+        each chunk of applied voltages.
+
+        Args:
+            applied_voltages: Iterable of arrays of applied voltages, each of
+                shape `m x p_k`, where `p_k` is the number of examples in
+                chunk `k`.
+            **kwargs: Keyword arguments of `apply()`.
+
+        Yields:
+            Branch currents and node voltages of the crossbar for each chunk.
+        """
+        for chunk in applied_voltages:
+            yield self.apply(chunk, **kwargs)
@@ -1,2 +1,2 @@
-from . import extract
+from . import adjoint, extract, newton, woodbury
 from .extract import Currents, Solution, Voltages
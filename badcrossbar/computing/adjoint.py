@@ -0,0 +1,107 @@
+import logging
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import extract, kcl, solve
+
+logger = logging.getLogger(__name__)
+
+
+def vjp(
+    resistances: npt.NDArray, r_i, applied_voltages: npt.NDArray, **kwargs
+) -> tuple[npt.NDArray, Callable[[npt.NDArray], tuple[npt.NDArray, npt.NDArray]]]:
+    """Computes output currents and a function that back-propagates their
+    gradients.
+
+    The gradients are obtained using the adjoint method: since `g` is
+    symmetric, a single solve of the adjoint system `g x = dL/dv` with the
+    factorization of the forward problem gives the gradients with respect to
+    all the device resistances and applied voltages.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+        **kwargs: Keyword arguments of `solve.factorize()`, as well as
+            `factorization` for the same resistances.
+
+    Returns:
+        Output currents of shape `p x n` and a function that, given gradients
+        of a scalar with respect to the output currents, returns gradients of
+        that scalar with respect to the resistances (of shape `m x n`) and
+        the applied voltages (of shape `m x p`).
+    """
+    conductances = 1 / resistances
+    source_conductances = kcl.segment_conductances(r_i.word_line, resistances.shape)[:, [0]]
+    sink_conductances = kcl.segment_conductances(r_i.bit_line, resistances.shape)[-1, :, np.newaxis]
+    shape = resistances.shape + (applied_voltages.shape[1],)
+    dtype = kcl.float_dtype(resistances, applied_voltages)
+
+    if kcl.insulating(r_i):
+        output_i = np.zeros((applied_voltages.shape[1], resistances.shape[1]), dtype=dtype)
+
+        def zero_vjp(output_gradients: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+            resistance_gradients = np.zeros(resistances.shape, dtype=dtype)
+            return resistance_gradients, np.zeros(applied_voltages.shape, dtype=dtype)
+
+        return output_i, zero_vjp
+
+    factorization = kwargs.get("factorization")
+    if factorization is None:
+        factorization = solve.factorize(resistances, r_i, **kwargs)
+
+    v_matrix = solve.unknown_v(resistances, r_i, applied_voltages, factorization=factorization)
+    output_i = extract.solved_output_currents(v_matrix, resistances, r_i, applied_voltages)
+    v = solve.expand(v_matrix, resistances, r_i, applied_voltages)
+    v_diff = v[: resistances.size].reshape(shape) - v[resistances.size :].reshape(shape)
+
+    def output_vjp(output_gradients: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+        """Back-propagates gradients of the output currents.
+
+        Args:
+            output_gradients: Gradients of a scalar with respect to the output
+                currents, of shape `p x n`.
+
+        Returns:
+            Gradients with respect to the resistances and applied voltages.
+        """
+        output_gradients = np.asarray(output_gradients, dtype=dtype).reshape(output_i.shape)
+        output_gradients_t = np.transpose(output_gradients)
+
+        # adjoint potentials are zero at the nodes with known potentials.
+        word_line_adjoint = bit_line_adjoint = np.zeros(shape, dtype=dtype)
+        if factorization is not None:
+            logger.info("Started solving adjoint system.")
+            if kcl.resistive(r_i.bit_line):
+                adjoint_i = np.zeros(v_matrix.shape, dtype=dtype)
+                adjoint_i[-resistances.shape[1] :] = output_gradients_t * sink_conductances
+            else:
+                adjoint_i = conductances[:, :, np.newaxis] * output_gradients_t[np.newaxis]
+            adjoint_v = factorization(adjoint_i.reshape(v_matrix.shape))
+            adjoint_v = adjoint_v.reshape(v_matrix.shape)
+            logger.info("Solved adjoint system.")
+            if kcl.resistive(r_i.word_line):
+                word_line_adjoint = adjoint_v[: resistances.size].reshape(shape)
+            if kcl.resistive(r_i.bit_line):
+                bit_line_adjoint = adjoint_v[-resistances.size :].reshape(shape)
+
+        conductance_gradients = -np.einsum(
+            "ijk,ijk->ij", word_line_adjoint - bit_line_adjoint, v_diff
+        )
+        if not kcl.resistive(r_i.bit_line):
+            # output currents are sums of the device currents.
+            word_line_v = v[: resistances.size].reshape(shape)
+            conductance_gradients += np.einsum("ijk,kj->ij", word_line_v, output_gradients)
+
+        if kcl.resistive(r_i.word_line):
+            voltage_gradients = word_line_adjoint[:, 0] * source_conductances
+        else:
+            voltage_gradients = np.einsum("ij,ijk->ik", conductances, bit_line_adjoint)
+            if not kcl.resistive(r_i.bit_line):
+                voltage_gradients += conductances @ output_gradients_t
+
+        resistance_gradients = -conductance_gradients * conductances**2
+        return resistance_gradients, voltage_gradients
+
+    return output_i, output_vjp
@@ -1,26 +1,45 @@
+import functools
 import logging
+import os
 from collections import namedtuple
+from typing import Any, Callable, Optional, Union
 
 import numpy as np
 import numpy.typing as npt
 from badcrossbar import utils
-from badcrossbar.computing import solve
+from badcrossbar.computing import iterative, kcl, newton, solve
 
 logger = logging.getLogger(__name__)
 
 
 Interconnect = namedtuple("Interconnect", ["word_line", "bit_line"])
-Solution = namedtuple("Solution", ["currents", "voltages"])
 Currents = namedtuple("Currents", ["output", "device", "word_line", "bit_line"])
 Voltages = namedtuple("Voltages", ["word_line", "bit_line"])
 
 
+class Solution(namedtuple("Solution", ["currents", "voltages"])):
+    """Branch currents and node voltages of a crossbar.
+
+    Attribute `info` contains the statistics of Newton's method (see
+    `newton.v()`) if the devices are nonlinear, or of the iterative solver
+    (see `iterative.IterativeSolver`) if one is used, and is None otherwise.
+    """
+
+    info: Optional[Union[newton.NewtonInfo, iterative.SolverInfo]] = None
+
+
+# number of arrays with one element per node that solving and extraction hold
+# per example: matrix `i`, the solution of `gv = i`, a copy made by the
+# solver and the potentials at all the nodes.
+WORKING_ARRAYS = 4
+
+
 def solution(
     resistances: npt.NDArray,
     r_i_word_line: float,
     r_i_bit_line: float,
     applied_voltages: npt.NDArray,
-    **kwargs
+    **kwargs,
 ) -> Solution:
     """Extracts branch currents and node voltages of a crossbar in a
     convenient form.
@@ -31,31 +50,450 @@ def solution(
         r_i_bit_line: Interconnect resistance of the bit line segments.
         applied_voltages: Applied voltages.
         **node_voltages: If False, None is returned instead of node voltages.
+        **factorization: Factorization of matrix `g` returned by
+            `solve.factorize()`.
+        **device_current: If passed, devices are nonlinear and node
+            voltages are found using `newton.v()`.
+        **device_conductance: Derivative of `device_current`.
+        **newton_tol: Tolerance of Newton's method.
+        **newton_maxiter: Maximum number of Newton iterations.
+        **out: Buffers that the currents are written to, as in `currents()`.
+        **lazy: If True, the system of nodal equations is solved immediately,
+            but branch currents and node voltages are only extracted when
+            they are first accessed; see `lazy_solution()`.
 
     Returns:
         Branch currents and node voltages of the crossbar.
     """
     r_i = Interconnect(r_i_word_line, r_i_bit_line)
 
-    if r_i.word_line == r_i.bit_line == np.inf:
+    if kcl.insulating(r_i):
         return insulating_interconnect_solution(resistances, applied_voltages, **kwargs)
 
-    v = solve.v(resistances, r_i, applied_voltages)
+    info = extracted_solution = None
+    if kwargs.get("device_current") is not None:
+        v, info = newton.v(
+            resistances,
+            r_i,
+            applied_voltages,
+            kwargs["device_current"],
+            kwargs["device_conductance"],
+            tol=kwargs.get("newton_tol", 1e-9),
+            maxiter=kwargs.get("newton_maxiter", 50),
+        )
+        if kwargs.get("lazy"):
+            extracted_solution = lazy_solution(resistances, r_i, applied_voltages, v=v, **kwargs)
+    else:
+        if kwargs.get("factorization") is None and kwargs.get("solver", "direct") != "direct":
+            # the iterative solver is created here so that its statistics can
+            # be returned.
+            kwargs["factorization"] = solve.factorize(resistances, r_i, **kwargs)
+        v_matrix = solve.unknown_v(resistances, r_i, applied_voltages, **kwargs)
+        info = getattr(kwargs.get("factorization"), "info", None)
+        if kwargs.get("lazy"):
+            extracted_solution = lazy_solution(
+                resistances, r_i, applied_voltages, v_matrix=v_matrix, **kwargs
+            )
+        elif not kwargs.get("all_currents") and not kwargs.get("node_voltages"):
+            output_i = solved_output_currents(v_matrix, resistances, r_i, applied_voltages)
+            log_currents(**kwargs)
+            extracted_solution = Solution(Currents(output_i, None, None, None), None)
+        else:
+            v = solve.expand(v_matrix, resistances, r_i, applied_voltages)
+
+    if extracted_solution is None:
+        extracted_voltages = voltages(v, resistances, **kwargs)
+        if kwargs.get("node_voltages"):
+            logger.info("Extracted node voltages.")
+        extracted_currents = currents(
+            extracted_voltages, resistances, r_i, applied_voltages, **kwargs
+        )
+        log_currents(**kwargs)
+        if kwargs.get("node_voltages") is not True:
+            extracted_voltages = None
+        extracted_solution = Solution(extracted_currents, extracted_voltages)
+    extracted_solution.info = info
+    return extracted_solution
 
-    extracted_voltages = voltages(v, resistances, **kwargs)
-    extracted_currents = currents(extracted_voltages, resistances, r_i, applied_voltages, **kwargs)
+
+def chunk_size(resistances: npt.NDArray, applied_voltages: npt.NDArray, memory_limit: int) -> int:
+    """Estimates the number of examples that can be solved for at once.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        applied_voltages: Applied voltages.
+        memory_limit: Memory (in bytes) available for the intermediate
+            arrays of a single chunk of examples.
+
+    Returns:
+        Number of examples in each chunk, at least one.
+    """
+    itemsize = kcl.float_dtype(applied_voltages, resistances).itemsize
+    example_memory = WORKING_ARRAYS * 2 * resistances.size * itemsize
+    return max(1, int(memory_limit // example_memory))
+
+
+def chunked_solution(
+    resistances: npt.NDArray,
+    r_i_word_line: float,
+    r_i_bit_line: float,
+    applied_voltages: npt.NDArray,
+    memory_limit: Optional[int] = None,
+    **kwargs,
+) -> Solution:
+    """Extracts branch currents and node voltages of a crossbar chunk by chunk
+    of examples.
+
+    Memory needed to solve for and extract the solution grows linearly with
+    the number of examples, so the applied voltages are split into chunks of
+    columns whose intermediate arrays fit into `memory_limit`. Matrix `g` is
+    factorized once, and the results of each chunk are written into arrays
+    allocated in advance for all the examples.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+        applied_voltages: Applied voltages.
+        memory_limit: Memory (in bytes) available for the intermediate
+            arrays. It does not include the returned arrays. If None, all
+            the examples are solved for at once.
+        **output_dir: If passed, the returned arrays are memory-mapped `.npy`
+            files in this directory, named after the fields, e.g.
+            `device_currents.npy` or `word_line_voltages.npy`. The directory
+            is created if it does not exist. Existing files are not
+            overwritten; a number is appended to the names instead.
+        **kwargs: Keyword arguments of `solution()`, except `lazy` and `out`.
+
+    Returns:
+        Branch currents and node voltages of the crossbar.
+    """
+    r_i = Interconnect(r_i_word_line, r_i_bit_line)
+    output_dir = kwargs.get("output_dir")
+    kwargs = {
+        key: value for key, value in kwargs.items() if key not in ("lazy", "out", "output_dir")
+    }
+    num_examples = applied_voltages.shape[1]
+    examples_per_chunk = num_examples
+    if memory_limit is not None:
+        examples_per_chunk = chunk_size(resistances, applied_voltages, memory_limit)
+    if output_dir is None and (kcl.insulating(r_i) or examples_per_chunk >= num_examples):
+        return solution(resistances, r_i_word_line, r_i_bit_line, applied_voltages, **kwargs)
+
+    if (
+        not kcl.insulating(r_i)
+        and kwargs.get("device_current") is None
+        and kwargs.get("factorization") is None
+    ):
+        kwargs["factorization"] = solve.factorize(resistances, r_i, **kwargs)
+
+    memory_maps = []
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def allocate(shape: tuple[int, ...], name: str) -> npt.NDArray:
+        dtype = kcl.float_dtype(applied_voltages, resistances)
+        if output_dir is None:
+            return np.empty(shape, dtype=dtype)
+        path = utils.unique_path(os.path.join(output_dir, name), "npy")
+        logger.info(f"Writing {name.replace('_', ' ')} to {path}.")
+        memory_maps.append(np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape))
+        return memory_maps[-1]
+
+    branch_shape = resistances.shape + (num_examples,)
+    output_i = allocate((num_examples, resistances.shape[1]), "output_currents")
+    branch_i = node_v = None
+    if kwargs.get("all_currents"):
+        branch_i = Currents(
+            output_i,
+            *(allocate(branch_shape, f"{field}_currents") for field in Currents._fields[1:]),
+        )
+    if kwargs.get("node_voltages") and not kcl.insulating(r_i):
+        node_v = Voltages(
+            *(allocate(branch_shape, f"{field}_voltages") for field in Voltages._fields)
+        )
+
+    infos = []
+    logger.info(f"Started solving for {num_examples} examples in chunks of {examples_per_chunk}.")
+    for start in range(0, num_examples, examples_per_chunk):
+        examples = slice(start, start + examples_per_chunk)
+        out = None
+        if branch_i is not None:
+            out = Currents(None, *(_chunk(i, examples) for i in branch_i[1:]))
+        chunk_solution = solution(
+            resistances,
+            r_i_word_line,
+            r_i_bit_line,
+            applied_voltages[:, examples],
+            out=out,
+            **kwargs,
+        )
+        infos.append(chunk_solution.info)
+        output_i[examples] = chunk_solution.currents.output
+        if branch_i is not None:
+            # currents that were not written to the buffers, e.g. the zeros
+            # of insulating interconnects, are copied.
+            for buffer, chunk_i in zip(out[1:], chunk_solution.currents[1:]):
+                if chunk_i is not buffer:
+                    buffer[...] = chunk_i
+        if node_v is not None:
+            for v, chunk_v in zip(node_v, chunk_solution.voltages):
+                _chunk(v, examples)[...] = chunk_v
+    logger.info(f"Solved for {num_examples} examples in chunks of {examples_per_chunk}.")
+
+    if branch_i is not None:
+        extracted_currents = Currents(*(utils.squeeze_third_axis(i) for i in branch_i))
+    else:
+        extracted_currents = Currents(output_i, None, None, None)
     if kwargs.get("node_voltages") is not True:
         extracted_voltages = None
+    elif node_v is None:
+        extracted_voltages = Voltages(None, None)
+    else:
+        extracted_voltages = Voltages(*(utils.squeeze_third_axis(v) for v in node_v))
+
+    for memory_map in memory_maps:
+        memory_map.flush()
     extracted_solution = Solution(extracted_currents, extracted_voltages)
+    if infos and infos[0] is not None:
+        extracted_solution.info = type(infos[0])(*(np.concatenate(field) for field in zip(*infos)))
     return extracted_solution
 
 
+def _chunk(array: npt.NDArray, examples: slice) -> npt.NDArray:
+    """Returns a view of some of the examples of an array of branch or node
+    values in the same format as the solution of those examples alone.
+
+    Args:
+        array: Array of shape `m x n x p`.
+        examples: Slice of the examples.
+
+    Returns:
+        View of the array.
+    """
+    return utils.squeeze_third_axis(array[..., examples])
+
+
+class LazyRecord:
+    """Stand-in for a named tuple whose fields are computed on first access.
+
+    Fields can be accessed by name or index, or by iterating over the record,
+    just like the fields of the named tuple. Each field is computed at most
+    once. When pickled, the record is converted to the named tuple.
+
+    Args:
+        record_type: Named tuple type, e.g. `Currents`.
+        **getters: Functions without arguments that compute each of the
+            fields.
+    """
+
+    def __init__(self, record_type: type, **getters: Callable[[], Any]):
+        self._type = record_type
+        self._getters = getters
+        self._values = {}
+
+    @property
+    def _fields(self) -> tuple[str, ...]:
+        return self._type._fields
+
+    def __getattr__(self, name: str) -> Any:
+        # only called if normal attribute lookup fails.
+        getters = self.__dict__.get("_getters", {})
+        if name not in getters:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        values = self.__dict__["_values"]
+        if name not in values:
+            values[name] = getters[name]()
+        return values[name]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return tuple(self)[idx]
+        return getattr(self, self._fields[idx])
+
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{field}={self._values[field]!r}" if field in self._values else f"{field}=..."
+            for field in self._fields
+        )
+        return f"{self._type.__name__}({fields})"
+
+    def __reduce__(self):
+        return self._type._make, (tuple(self),)
+
+    def _asdict(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self._fields}
+
+
+def lazy_solution(
+    resistances: npt.NDArray,
+    r_i: Interconnect,
+    applied_voltages: npt.NDArray,
+    v: Optional[npt.NDArray] = None,
+    v_matrix: Optional[npt.NDArray] = None,
+    **kwargs,
+) -> Solution:
+    """Wraps the solution of the nodal equations so that branch currents and
+    node voltages are only extracted when they are accessed.
+
+    Output currents of ohmic crossbars are extracted directly from `v_matrix`
+    without reconstructing the node voltages of the whole crossbar.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+        v: Potentials at each of the nodes. If None, they are obtained from
+            `v_matrix`.
+        v_matrix: Solution returned by `solve.unknown_v()`.
+        **kwargs: Keyword arguments of `currents()`.
+
+    Returns:
+        Named tuple `Solution` whose fields `currents` and `voltages` are
+        `LazyRecord`s standing in for `Currents` and `Voltages`.
+    """
+    ohmic = v is None
+
+    @functools.lru_cache(maxsize=None)
+    def all_v() -> npt.NDArray:
+        if v is not None:
+            return v
+        return solve.expand(v_matrix, resistances, r_i, applied_voltages)
+
+    extracted_voltages = LazyRecord(
+        Voltages,
+        word_line=lambda: word_line_voltages(all_v(), resistances),
+        bit_line=lambda: bit_line_voltages(all_v(), resistances),
+    )
+
+    def output() -> npt.NDArray:
+        if ohmic:
+            return solved_output_currents(v_matrix, resistances, r_i, applied_voltages)
+        return output_currents(extracted_voltages, extracted_currents.device, r_i)
+
+    out = kwargs.get("out") or Currents(None, None, None, None)
+    if kwargs.get("all_currents"):
+        extracted_currents = LazyRecord(
+            Currents,
+            output=output,
+            device=lambda: device_currents(
+                extracted_voltages, resistances, kwargs.get("device_current"), out=out.device
+            ),
+            word_line=lambda: word_line_currents(
+                extracted_voltages,
+                extracted_currents.device,
+                r_i,
+                applied_voltages,
+                out=out.word_line,
+            ),
+            bit_line=lambda: bit_line_currents(
+                extracted_voltages, extracted_currents.device, r_i, out=out.bit_line
+            ),
+        )
+    else:
+        extracted_currents = LazyRecord(
+            Currents, output=output, **{field: lambda: None for field in Currents._fields[1:]}
+        )
+
+    if kwargs.get("node_voltages") is not True:
+        return Solution(extracted_currents, None)
+    return Solution(extracted_currents, extracted_voltages)
+
+
+def batch_solution(
+    resistances: npt.NDArray,
+    r_i_word_line: float,
+    r_i_bit_line: float,
+    applied_voltages: npt.NDArray,
+    **kwargs,
+) -> Solution:
+    """Extracts branch currents and node voltages of multiple crossbars.
+
+    Args:
+        resistances: Resistances of crossbar devices of shape `k x m x n`,
+            where `k` is the number of crossbars.
+        r_i_word_line: Interconnect resistance of the word line segments.
+        r_i_bit_line: Interconnect resistance of the bit line segments.
+        applied_voltages: Applied voltages of shape `k x m x p`.
+        **node_voltages: If False, None is returned instead of node voltages.
+        **all_currents: If False, only output currents are returned, while all
+            the other ones are set to None.
+
+    Returns:
+        Branch currents and node voltages of the crossbars. Each of the arrays
+        has an additional leading axis of length `k`.
+    """
+    r_i = Interconnect(r_i_word_line, r_i_bit_line)
+    num_crossbars = resistances.shape[0]
+
+    if kcl.insulating(r_i):
+        tile_solutions = [
+            insulating_interconnect_solution(resistances[idx], applied_voltages[idx], **kwargs)
+            for idx in range(num_crossbars)
+        ]
+    else:
+        v = solve.v_batch(resistances, r_i, applied_voltages, **kwargs)
+        tile_solutions = []
+        for idx in range(num_crossbars):
+            extracted_voltages = voltages(v[idx], resistances[idx], **kwargs)
+            extracted_currents = currents(
+                extracted_voltages, resistances[idx], r_i, applied_voltages[idx], **kwargs
+            )
+            tile_solutions.append(Solution(extracted_currents, extracted_voltages))
+        if kwargs.get("node_voltages"):
+            logger.info("Extracted node voltages.")
+        log_currents(**kwargs)
+
+    extracted_currents = Currents(
+        *(stack(fields) for fields in zip(*(s.currents for s in tile_solutions)))
+    )
+    if kwargs.get("node_voltages") is True:
+        extracted_voltages = Voltages(
+            *(stack(fields) for fields in zip(*(s.voltages for s in tile_solutions)))
+        )
+    else:
+        extracted_voltages = None
+    return Solution(extracted_currents, extracted_voltages)
+
+
+def stack(arrays: tuple[Optional[npt.NDArray], ...]) -> Optional[npt.NDArray]:
+    """Stacks arrays of multiple crossbars along a new leading axis.
+
+    Args:
+        arrays: Arrays of the same shape, or Nones.
+
+    Returns:
+        Stacked array, or None if the arrays are None.
+    """
+    if arrays[0] is None:
+        return None
+    return np.stack(arrays)
+
+
+def log_currents(**kwargs):
+    """Logs which currents have been extracted.
+
+    Args:
+        **all_currents: If False, only output currents have been extracted.
+    """
+    if kwargs.get("all_currents"):
+        logger.info("Extracted currents from all branches in the crossbar.")
+    else:
+        logger.info("Extracted output currents.")
+
+
 def currents(
     extracted_voltages: Voltages,
     resistances: npt.NDArray,
     r_i: Interconnect,
     applied_voltages: npt.NDArray,
-    **kwargs
+    **kwargs,
 ) -> Currents:
     """Extracts crossbar branch currents in a convenient format.
 
@@ -68,6 +506,10 @@ def currents(
         applied_voltages: Applied voltages.
         **all_currents: If False, only output currents are returned, while all
             the other ones are set to None.
+        **out: Named tuple with fields `device`, `word_line` and `bit_line`
+            (the rest are ignored) containing arrays that the corresponding
+            currents are written to, or Nones. The arrays must have the shape
+            and type of the currents.
 
     Returns:
         Crossbar branch currents. Named tuple has fields `output`, `device`,
@@ -75,15 +517,18 @@ def currents(
         currents flowing through the devices and interconnect segments of the
         word and bit lines.
     """
-    device_i = device_currents(extracted_voltages, resistances)
+    out = kwargs.get("out") or Currents(None, None, None, None)
+    device_i = device_currents(
+        extracted_voltages, resistances, kwargs.get("device_current"), out=out.device
+    )
     output_i = output_currents(extracted_voltages, device_i, r_i)
     if kwargs.get("all_currents"):
-        word_line_i = word_line_currents(extracted_voltages, device_i, r_i, applied_voltages)
-        bit_line_i = bit_line_currents(extracted_voltages, device_i, r_i)
-        logger.info("Extracted currents from all branches in the crossbar.")
+        word_line_i = word_line_currents(
+            extracted_voltages, device_i, r_i, applied_voltages, out=out.word_line
+        )
+        bit_line_i = bit_line_currents(extracted_voltages, device_i, r_i, out=out.bit_line)
     else:
         device_i = word_line_i = bit_line_i = None
-        logger.info("Extracted output currents.")
 
     extracted_currents = Currents(output_i, device_i, word_line_i, bit_line_i)
     return extracted_currents
@@ -103,8 +548,6 @@ def voltages(v: npt.NDArray, resistances: npt.NDArray, **kwargs) -> Voltages:
     word_line_v = word_line_voltages(v, resistances)
     bit_line_v = bit_line_voltages(v, resistances)
     extracted_voltages = Voltages(word_line_v, bit_line_v)
-    if kwargs.get("node_voltages"):
-        logger.info("Extracted node voltages.")
     return extracted_voltages
 
 
@@ -155,12 +598,12 @@ def output_currents(
     Returns:
         Output currents.
     """
-    if r_i.bit_line > 0:
-        output_i = (
-            extracted_voltages.bit_line[
-                -1,
-            ]
-            / r_i.bit_line
+    if kcl.resistive(r_i.bit_line):
+        sink_conductances = kcl.segment_conductances(
+            r_i.bit_line, extracted_voltages.bit_line.shape[:2]
+        )[-1]
+        output_i = extracted_voltages.bit_line[-1] * _along_examples(
+            sink_conductances, extracted_voltages.bit_line.ndim - 1
         )
     else:
         output_i = np.sum(extracted_device_currents, axis=0)
@@ -171,7 +614,104 @@ def output_currents(
     return output_i
 
 
-def device_currents(extracted_voltages: Voltages, resistances: npt.NDArray):
+def solved_output_currents(
+    v_matrix: Optional[npt.NDArray],
+    resistances: npt.NDArray,
+    r_i: Interconnect,
+    applied_voltages: npt.NDArray,
+) -> npt.NDArray:
+    """Extracts output currents directly from the solution of `gv = i`.
+
+    Unlike `output_currents()`, node voltages of the whole crossbar are not
+    reconstructed. If the bit lines have non-zero interconnect resistance,
+    only the potentials at the nodes on the last word line are used;
+    otherwise, the device currents are summed along the bit lines without
+    being stored.
+
+    Args:
+        v_matrix: Solution returned by `solve.unknown_v()`.
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+
+    Returns:
+        Output currents.
+    """
+    num_bit_lines = resistances.shape[1]
+    if kcl.resistive(r_i.bit_line):
+        # potentials at the nodes on the bit lines are the last `mn` entries.
+        sink_conductances = kcl.segment_conductances(r_i.bit_line, resistances.shape)[-1]
+        return np.transpose(v_matrix[-num_bit_lines:] * sink_conductances[:, np.newaxis])
+
+    conductances = 1 / resistances
+    if kcl.resistive(r_i.word_line):
+        word_line_v = v_matrix.reshape(resistances.shape + (-1,))
+        return np.einsum("ijk,ij->kj", word_line_v, conductances)
+
+    return np.transpose(applied_voltages) @ conductances
+
+
+def effective_conductances(resistances: npt.NDArray, r_i: Interconnect, **kwargs) -> npt.NDArray:
+    """Computes matrix `W` such that output currents are equal to `V^T W`,
+    where `V` are the applied voltages.
+
+    The output currents depend on the applied voltages linearly. If there are
+    fewer word lines than bit lines, `W` is obtained by applying unit voltage
+    to each word line in turn; otherwise, `g` is symmetric, and so `W` is
+    obtained from the adjoint system with one right-hand side per bit line.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        **kwargs: Keyword arguments of `solve.unknown_v()`.
+
+    Returns:
+        Effective conductance matrix of shape `m x n`.
+    """
+    num_word_lines, num_bit_lines = resistances.shape
+    dtype = kcl.float_dtype(resistances)
+    if kcl.insulating(r_i):
+        return np.zeros(resistances.shape, dtype=dtype)
+
+    conductances = 1 / resistances
+    if not kcl.resistive(r_i.word_line) and not kcl.resistive(r_i.bit_line):
+        return conductances
+
+    if num_word_lines <= num_bit_lines:
+        unit_voltages = np.eye(num_word_lines, dtype=dtype)
+        v_matrix = solve.unknown_v(resistances, r_i, unit_voltages, **kwargs)
+        return solved_output_currents(v_matrix, resistances, r_i, unit_voltages)
+
+    # output currents are a linear function `L v` of the solution, so
+    # `W = B^T g^-1 L^T`, where `i = B V`.
+    num_nodes = kcl.num_nodes(resistances.size, r_i)
+    adjoint_i = np.zeros((num_nodes, num_bit_lines), dtype=dtype)
+    if kcl.resistive(r_i.bit_line):
+        adjoint_i[-num_bit_lines:] = np.diag(
+            kcl.segment_conductances(r_i.bit_line, resistances.shape)[-1]
+        )
+    else:
+        adjoint_i = adjoint_i.reshape(resistances.shape + (num_bit_lines,))
+        adjoint_i[:, np.arange(num_bit_lines), np.arange(num_bit_lines)] = conductances
+        adjoint_i = adjoint_i.reshape(num_nodes, num_bit_lines)
+
+    factorization = kwargs.get("factorization")
+    if factorization is None:
+        factorization = solve.factorize(resistances, r_i, **kwargs)
+    adjoint_v = factorization(adjoint_i).reshape(num_nodes, num_bit_lines)
+
+    if kcl.resistive(r_i.word_line):
+        source_conductances = kcl.segment_conductances(r_i.word_line, resistances.shape)[:, [0]]
+        return adjoint_v[: resistances.size : num_bit_lines] * source_conductances
+    return np.einsum("ij,ijk->ik", conductances, adjoint_v.reshape(resistances.shape + (-1,)))
+
+
+def device_currents(
+    extracted_voltages: Voltages,
+    resistances: npt.NDArray,
+    device_current: Optional[newton.DeviceFunction] = None,
+    out: Optional[npt.NDArray] = None,
+):
     """Extracts currents flowing through crossbar devices.
 
     Args:
@@ -179,19 +719,28 @@ def device_currents(extracted_voltages: Voltages, resistances: npt.NDArray):
             and `bit_line` that contain the potentials at the nodes on the word
             and bit lines.
         resistances: Resistances of crossbar devices.
+        device_current: Current-voltage characteristic of nonlinear devices.
+            If None, devices are ohmic.
+        out: Array of the same shape as the node voltages that the currents
+            are written to. If None, a new array is allocated.
 
     Returns:
         Currents flowing through crossbar devices.
     """
-    if extracted_voltages.word_line.ndim > 2:
-        resistances = np.repeat(
-            resistances[:, :, np.newaxis], extracted_voltages.word_line.shape[2], axis=2
+    v_diff = np.subtract(
+        extracted_voltages.word_line,
+        extracted_voltages.bit_line,
+        out=_empty(extracted_voltages.word_line, out),
+    )
+    if device_current is not None:
+        device_i = device_current(
+            v_diff.reshape(resistances.shape + (-1,)), resistances[:, :, np.newaxis]
         )
+        v_diff[...] = device_i.reshape(v_diff.shape)
+        return v_diff
 
-    v_diff = extracted_voltages.word_line - extracted_voltages.bit_line
-    device_i = v_diff / resistances
-
-    return device_i
+    # resistances are broadcast along the examples instead of being repeated.
+    return np.divide(v_diff, _along_examples(resistances, v_diff.ndim), out=v_diff)
 
 
 def word_line_currents(
@@ -199,6 +748,7 @@ def word_line_currents(
     extracted_device_currents: npt.NDArray,
     r_i: Interconnect,
     applied_voltages: npt.NDArray,
+    out: Optional[npt.NDArray] = None,
 ) -> npt.NDArray:
     """Extracts currents flowing through interconnect segments along the word
     lines.
@@ -210,64 +760,38 @@ def word_line_currents(
         extracted_device_currents: Currents flowing through crossbar devices.
         r_i: Interconnect resistances along the word and bit line segments.
         applied_voltages: Applied voltages.
+        out: Array of the same shape as `extracted_device_currents` that the
+            currents are written to. If None, a new array is allocated.
 
     Returns:
         Currents flowing through interconnect segments along the word lines.
     """
-    if r_i.word_line > 0:
-        word_line_i = np.zeros(extracted_device_currents.shape)
-        if extracted_voltages.word_line.ndim > 2:
-            v_diff = (
-                applied_voltages
-                - extracted_voltages.word_line[
-                    :,
-                    0,
-                ]
-            )
-            word_line_i[:, 0,] = (
-                v_diff / r_i.word_line
-            )
-        else:
-            v_diff = applied_voltages - extracted_voltages.word_line[:, [0]]
-            word_line_i[:, [0]] = v_diff / r_i.word_line
-
-        v_diff = (
-            extracted_voltages.word_line[
-                :,
-                :-1,
-            ]
-            - extracted_voltages.word_line[
-                :,
-                1:,
-            ]
+    if kcl.resistive(r_i.word_line):
+        word_line_i = _empty(extracted_device_currents, out)
+        word_line_v = extracted_voltages.word_line
+        np.subtract(
+            applied_voltages.reshape(word_line_v[:, :1].shape),
+            word_line_v[:, :1],
+            out=word_line_i[:, :1],
         )
-        word_line_i[:, 1:,] = (
-            v_diff / r_i.word_line
+        np.subtract(word_line_v[:, :-1], word_line_v[:, 1:], out=word_line_i[:, 1:])
+        word_line_i *= _along_examples(
+            kcl.segment_conductances(r_i.word_line, word_line_i.shape[:2]), word_line_i.ndim
         )
     else:
-        word_line_i = np.repeat(
-            extracted_device_currents[
-                :,
-                -1:,
-            ],
-            extracted_device_currents.shape[1],
-            axis=1,
-        )
-        for i in range(1, extracted_device_currents.shape[1]):
-            word_line_i[:, :-i,] += np.repeat(
-                extracted_device_currents[
-                    :,
-                    -(1 + i) : -i,
-                ],
-                extracted_device_currents.shape[1] - i,
-                axis=1,
-            )
+        # each segment carries the currents of all the devices to its right,
+        # so the currents are cumulative sums from the right end of the lines.
+        word_line_i = _empty(extracted_device_currents, out)
+        np.cumsum(extracted_device_currents[:, ::-1], axis=1, out=word_line_i[:, ::-1])
 
     return word_line_i
 
 
 def bit_line_currents(
-    extracted_voltages: Voltages, extracted_device_currents: npt.NDArray, r_i: Interconnect
+    extracted_voltages: Voltages,
+    extracted_device_currents: npt.NDArray,
+    r_i: Interconnect,
+    out: Optional[npt.NDArray] = None,
 ) -> npt.NDArray:
     """Extracts currents flowing through interconnect segments along the bit
     lines.
@@ -278,51 +802,64 @@ def bit_line_currents(
             and bit lines.
         extracted_device_currents: Currents flowing through crossbar devices.
         r_i: Interconnect resistances along the word and bit line segments.
+        out: Array of the same shape as `extracted_device_currents` that the
+            currents are written to. If None, a new array is allocated.
 
     Returns:
         Currents flowing through interconnect segments along the bit lines.
     """
-    if r_i.bit_line > 0:
-        bit_line_i = np.zeros(extracted_device_currents.shape)
-        v_diff = (
-            extracted_voltages.bit_line[
-                :-1,
-                :,
-            ]
-            - extracted_voltages.bit_line[
-                1:,
-                :,
-            ]
-        )
-        bit_line_i[:-1, :,] = (
-            v_diff / r_i.bit_line
+    if kcl.resistive(r_i.bit_line):
+        bit_line_i = _empty(extracted_device_currents, out)
+        bit_line_v = extracted_voltages.bit_line
+        np.subtract(bit_line_v[:-1], bit_line_v[1:], out=bit_line_i[:-1])
+        bit_line_i[-1] = bit_line_v[-1]
+        bit_line_i *= _along_examples(
+            kcl.segment_conductances(r_i.bit_line, bit_line_i.shape[:2]), bit_line_i.ndim
         )
-        if extracted_voltages.bit_line.ndim > 2:
-            v_diff = extracted_voltages.bit_line[
-                -1,
-                :,
-            ]
-            bit_line_i[-1, :,] = (
-                v_diff / r_i.bit_line
-            )
-        else:
-            v_diff = extracted_voltages.bit_line[[-1], :]
-            bit_line_i[[-1], :] = v_diff / r_i.bit_line
     else:
-        bit_line_i = np.zeros(extracted_device_currents.shape)
-        for i in range(extracted_device_currents.shape[0]):
-            bit_line_i[i:, :,] += np.repeat(
-                extracted_device_currents[
-                    i : i + 1,
-                    :,
-                ],
-                extracted_device_currents.shape[0] - i,
-                axis=0,
-            )
+        # each segment carries the currents of all the devices above it.
+        bit_line_i = _empty(extracted_device_currents, out)
+        np.cumsum(extracted_device_currents, axis=0, out=bit_line_i)
 
     return bit_line_i
 
 
+def _along_examples(array: npt.NDArray, ndim: int) -> npt.NDArray:
+    """Appends axes to an array so that it broadcasts against arrays with
+    examples along the last axis.
+
+    Args:
+        array: Array without the axis of examples.
+        ndim: Number of dimensions of the arrays it is broadcast against.
+
+    Returns:
+        Reshaped array.
+    """
+    return array.reshape(array.shape + (1,) * (ndim - array.ndim))
+
+
+def _empty(like: npt.NDArray, out: Optional[npt.NDArray] = None) -> npt.NDArray:
+    """Returns a buffer for the currents of the crossbar branches.
+
+    Args:
+        like: Array whose shape and type the buffer should have.
+        out: Buffer supplied by the caller. If None, a new one is allocated.
+
+    Returns:
+        Uninitialised buffer.
+
+    Raises:
+        ValueError: If the buffer has a different shape or type.
+    """
+    if out is None:
+        return np.empty_like(like)
+    if out.shape != like.shape:
+        raise ValueError(f"Output buffer has shape {out.shape} instead of {like.shape}!")
+    if out.dtype != like.dtype:
+        raise ValueError(f"Output buffer has type {out.dtype} instead of {like.dtype}!")
+    return out
+
+
 def insulating_interconnect_solution(
     resistances: npt.NDArray, applied_voltages: npt.NDArray, **kwargs
 ) -> Solution:
@@ -343,9 +880,12 @@ def insulating_interconnect_solution(
             "Warning: all interconnects are perfectly insulating! Node voltages are undefined!"
         )
 
-    output_i = np.zeros((applied_voltages.shape[1], resistances.shape[1]))
+    dtype = kcl.float_dtype(applied_voltages, resistances)
+    output_i = np.zeros((applied_voltages.shape[1], resistances.shape[1]), dtype=dtype)
     if kwargs.get("all_currents", True):
-        same_i = np.zeros((resistances.shape[0], resistances.shape[1], applied_voltages.shape[1]))
+        same_i = np.zeros(
+            (resistances.shape[0], resistances.shape[1], applied_voltages.shape[1]), dtype=dtype
+        )
         same_i = utils.squeeze_third_axis(same_i)
         device_i = word_line_i = bit_line_i = same_i
         logger.info("Extracted currents from all branches in the crossbar.")
@@ -1,28 +1,77 @@
+from typing import Union
+
 import numpy as np
 import numpy.typing as npt
-from badcrossbar.computing import kcl
-from scipy.sparse import lil_matrix
+from badcrossbar.computing import kcl, pattern
+from scipy.sparse import csc_matrix, lil_matrix
 
 
-def g(resistances: npt.NDArray, r_i) -> lil_matrix:
+def g(resistances: npt.NDArray, r_i, method: str = "coo") -> Union[csc_matrix, lil_matrix]:
     """Creates and fills matrix `g` used in equation `gv = i`.
 
     Args:
         resistances: Resistances of crossbar devices.
         r_i: Interconnect resistances along the word and bit line segments.
+        method: Assembly method. If `"coo"`, all non-zero entries are computed
+            at once and matrix `g` is constructed directly in CSC format using
+            a cached sparsity pattern. If `"lil"`, matrix `g` is filled line by
+            line in LIL format and only supports a single interconnect
+            resistance per line type.
 
     Returns:
         Filled matrix `g`.
     """
-    if 0 in r_i:
+    if kcl.ideal_lines(r_i):
         g_shape = tuple(resistances.size for _ in range(2))
     else:
         g_shape = tuple(2 * resistances.size for _ in range(2))
-    g_matrix = lil_matrix(g_shape)
-    g_matrix = kcl.apply(g_matrix, resistances, r_i)
+    if method == "coo":
+        with np.errstate(divide="ignore"):
+            conductances = 1.0 / resistances
+        g_pattern = pattern.get(resistances.shape, r_i)
+        data = pattern.values(g_pattern, conductances, r_i)
+        g_matrix = csc_matrix(
+            (data, g_pattern.indices.copy(), g_pattern.indptr.copy()), shape=g_shape
+        )
+    elif method == "lil":
+        if any(np.ndim(r) > 0 for r in r_i):
+            raise ValueError('Per-segment interconnect resistances require method "coo"!')
+        g_matrix = lil_matrix(g_shape)
+        g_matrix = kcl.apply(g_matrix, resistances, r_i)
+    else:
+        raise ValueError(f'Assembly method "{method}" is not supported!')
     return g_matrix
 
 
+def g_batch(resistances: npt.NDArray, r_i) -> csc_matrix:
+    """Creates block-diagonal matrix `g` of multiple crossbars.
+
+    All the crossbars share the same sparsity pattern, so it is computed only
+    once.
+
+    Args:
+        resistances: Resistances of crossbar devices of shape `k x m x n`,
+            where `k` is the number of crossbars.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Filled block-diagonal matrix `g`.
+    """
+    num_crossbars = resistances.shape[0]
+    g_pattern = pattern.get(resistances.shape[1:], r_i)
+    size = g_pattern.indptr.size - 1
+    nnz = g_pattern.indices.size
+
+    with np.errstate(divide="ignore"):
+        conductances = 1.0 / resistances
+    data = np.concatenate([pattern.values(g_pattern, c, r_i) for c in conductances])
+    offsets = np.arange(num_crossbars, dtype=np.int64)[:, np.newaxis]
+    indices = (g_pattern.indices + size * offsets).ravel()
+    indptr = np.append((g_pattern.indptr[:-1] + nnz * offsets).ravel(), num_crossbars * nnz)
+
+    return csc_matrix((data, indices, indptr), shape=(num_crossbars * size, num_crossbars * size))
+
+
 def i(applied_voltages: npt.NDArray, resistances: npt.NDArray, r_i) -> npt.NDArray:
     """Creates and fills matrix `i` used in equation `gv = i`.
 
@@ -37,13 +86,16 @@ def i(applied_voltages: npt.NDArray, resistances: npt.NDArray, r_i) -> npt.NDArr
     Returns:
         Filled matrix `i`.
     """
-    if 0 in r_i:
+    if kcl.ideal_lines(r_i):
         i_shape = (resistances.size, applied_voltages.shape[1])
     else:
         i_shape = (2 * resistances.size, applied_voltages.shape[1])
-    i_matrix = np.zeros(i_shape)
-    if r_i.word_line > 0:
-        i_matrix[: resistances.size : resistances.shape[1], :] = applied_voltages / r_i.word_line
+    i_matrix = np.zeros(i_shape, dtype=kcl.float_dtype(applied_voltages, resistances))
+    if kcl.resistive(r_i.word_line):
+        source_conductances = kcl.segment_conductances(r_i.word_line, resistances.shape)[:, [0]]
+        i_matrix[: resistances.size : resistances.shape[1], :] = (
+            applied_voltages * source_conductances
+        )
     else:
         i_matrix = np.divide(
             np.repeat(applied_voltages, resistances.shape[1], axis=0),
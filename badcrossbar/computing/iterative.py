@@ -0,0 +1,181 @@
+import logging
+from collections import namedtuple
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import kcl, tridiagonal
+from scipy.sparse import csc_matrix, linalg
+
+logger = logging.getLogger(__name__)
+
+SolverInfo = namedtuple("SolverInfo", ["iterations", "residuals"])
+
+METHODS = {"cg": linalg.cg, "minres": linalg.minres}
+
+
+class IterativeSolver:
+    """Solves equation `gv = i` using a Krylov subspace method.
+
+    Matrix `g` is symmetric positive definite, so conjugate gradient method
+    can be applied directly. Only the preconditioner is computed in advance,
+    thus memory usage does not suffer from the fill-in of direct methods.
+
+    Args:
+        g: Matrix `g` used in equation `gv = i`.
+        method: Iterative method. One of {`"cg"`, `"minres"`}.
+        tol: Relative tolerance of the residual.
+        maxiter: Maximum number of iterations per example. If None, the
+            default of the chosen method is used.
+        preconditioner: Preconditioner. One of {`"jacobi"`, `"ilu"`} or None.
+            Alternatively, a linear operator approximating the inverse of
+            `g`. MINRES requires the preconditioner to be symmetric positive
+            definite, which incomplete LU factorization does not guarantee.
+    """
+
+    def __init__(
+        self,
+        g: csc_matrix,
+        method: str = "cg",
+        tol: float = 1e-10,
+        maxiter: int = None,
+        preconditioner: Union[str, linalg.LinearOperator] = "jacobi",
+    ):
+        if method not in METHODS:
+            raise ValueError(f'Iterative method "{method}" is not supported!')
+        self.g = g
+        self.method = method
+        self.tol = tol
+        self.maxiter = maxiter
+        self.preconditioner = get_preconditioner(g, preconditioner)
+        self.info = None
+
+    def __call__(self, i: npt.NDArray) -> npt.NDArray:
+        """Solves equation `gv = i` for each column of `i` and stores the
+        statistics in `info`.
+
+        Args:
+            i: Matrix `i` used in equation `gv = i`.
+
+        Returns:
+            Matrix containing potentials at each of the nodes.
+        """
+        v_matrix, self.info = self.solve(i)
+        return v_matrix
+
+    def solve(self, i: npt.NDArray) -> tuple[npt.NDArray, SolverInfo]:
+        """Solves equation `gv = i` for each column of `i`.
+
+        Args:
+            i: Matrix `i` used in equation `gv = i`.
+
+        Returns:
+            Matrix containing potentials at each of the nodes and the number
+            of iterations and relative residual for each example.
+        """
+        i = i.reshape(i.shape[0], -1)
+        v_matrix = np.zeros(i.shape, dtype=np.result_type(i, self.g.dtype))
+        iterations = np.zeros(i.shape[1], dtype=int)
+        residuals = np.zeros(i.shape[1])
+
+        for example in range(i.shape[1]):
+            counter = _Counter()
+            v_matrix[:, example], status = METHODS[self.method](
+                self.g,
+                i[:, example],
+                rtol=self.tol,
+                maxiter=self.maxiter,
+                M=self.preconditioner,
+                callback=counter,
+            )
+            iterations[example] = counter.count
+            residuals[example] = residual(self.g, v_matrix[:, example], i[:, example])
+            if status > 0:
+                logger.warning(
+                    f"Iterative solver did not converge for example {example} after "
+                    f"{counter.count} iterations (relative residual {residuals[example]:.3g})."
+                )
+
+        logger.info(
+            f"Iterative solver ({self.method}) used at most {iterations.max()} iterations; "
+            f"maximum relative residual is {residuals.max():.3g}."
+        )
+        return v_matrix, SolverInfo(iterations, residuals)
+
+
+def get_preconditioner(
+    g: csc_matrix, preconditioner: Union[str, linalg.LinearOperator, None]
+) -> Union[linalg.LinearOperator, None]:
+    """Constructs preconditioner of matrix `g`.
+
+    Args:
+        g: Matrix `g` used in equation `gv = i`.
+        preconditioner: Name of the preconditioner or the preconditioner
+            itself.
+
+    Returns:
+        Linear operator approximating the inverse of `g`.
+    """
+    if preconditioner is None or not isinstance(preconditioner, str):
+        return preconditioner
+    if preconditioner == "jacobi":
+        inverse_diagonal = 1.0 / g.diagonal()
+        return linalg.LinearOperator(
+            g.shape, matvec=lambda x: inverse_diagonal * x.ravel(), dtype=g.dtype
+        )
+    if preconditioner == "ilu":
+        ilu = linalg.spilu(g.tocsc())
+        return linalg.LinearOperator(g.shape, matvec=ilu.solve, dtype=g.dtype)
+    raise ValueError(f'Preconditioner "{preconditioner}" is not supported!')
+
+
+def residual(g: csc_matrix, v: npt.NDArray, i: npt.NDArray) -> float:
+    """Computes relative residual of equation `gv = i`.
+
+    Args:
+        g: Matrix `g` used in equation `gv = i`.
+        v: Approximate solution.
+        i: Matrix `i` used in equation `gv = i`.
+
+    Returns:
+        Norm of the residual relative to the norm of `i`.
+    """
+    i_norm = np.linalg.norm(i)
+    if i_norm == 0:
+        return float(np.linalg.norm(g @ v))
+    return float(np.linalg.norm(g @ v - i) / i_norm)
+
+
+class _Counter:
+    """Counts the iterations of an iterative solver."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def line_preconditioner(resistances: npt.NDArray, r_i) -> linalg.LinearOperator:
+    """Constructs block-Jacobi preconditioner whose blocks are the word and
+    bit lines.
+
+    Matrix `g` consists of tridiagonal blocks, one for each word and bit line,
+    that are coupled only through the conductances of the devices. Neglecting
+    this coupling, the systems of all the lines are solved simultaneously.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Linear operator approximating the inverse of `g`.
+    """
+    with np.errstate(divide="ignore"):
+        conductances = 1.0 / resistances
+    solve_lines = tridiagonal.line_solver(conductances, r_i)
+    size = kcl.num_nodes(resistances.size, r_i)
+
+    return linalg.LinearOperator(
+        (size, size), matvec=solve_lines, matmat=solve_lines, dtype=conductances.dtype
+    )
@@ -142,3 +142,186 @@ def bit_line_nodes(g_matrix: lil_matrix, conductances: npt.NDArray, r_i) -> lil_
             g_matrix[idx, idx - conductances.size] = -conductances[0, :]
 
     return g_matrix
+
+
+def resistive(r) -> bool:
+    """Checks whether interconnect segments of a line type have non-zero
+    resistance, i.e. whether the potentials at their nodes are unknown.
+
+    Args:
+        r: Interconnect resistance, either a single number or an array of
+            shape `m x n` with the resistance of each segment.
+
+    Returns:
+        True if the resistance is non-zero.
+    """
+    return bool(np.all(np.greater(r, 0)))
+
+
+def ideal_lines(r_i) -> bool:
+    """Checks whether the word or bit lines have zero interconnect resistance.
+
+    Args:
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        True if at least one of the interconnect resistances is zero.
+    """
+    return not (resistive(r_i.word_line) and resistive(r_i.bit_line))
+
+
+def insulating(r_i) -> bool:
+    """Checks whether all interconnects are perfectly insulating.
+
+    Args:
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        True if both interconnect resistances are infinite.
+    """
+    return bool(np.all(np.isinf(r_i.word_line)) and np.all(np.isinf(r_i.bit_line)))
+
+
+def num_nodes(size: int, r_i) -> int:
+    """Computes the number of nodes with unknown potentials.
+
+    Args:
+        size: Number of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Size of matrix `g`.
+    """
+    return sum(size for r in r_i if resistive(r))
+
+
+def segment_conductances(r, shape: tuple[int, ...]) -> npt.NDArray:
+    """Computes conductances of interconnect segments.
+
+    The segment at index `(i, j)` of the word lines connects node `(i, j)`
+    to the node on its left (or to the source if `j == 0`), while the one of
+    the bit lines connects node `(i, j)` to the node below it (or to the sink
+    if `i == m-1`).
+
+    Args:
+        r: Interconnect resistance, either a single number or an array of
+            shape `m x n`.
+        shape: Shape of the array of crossbar devices, possibly with
+            additional leading axes.
+
+    Returns:
+        Read-only array of segment conductances of the given shape, of the
+        same floating-point type as `r`.
+    """
+    r = np.asarray(r)
+    if not np.issubdtype(r.dtype, np.floating):
+        r = r.astype(float)
+    with np.errstate(divide="ignore"):
+        return np.broadcast_to(1.0 / r, shape)
+
+
+def float_dtype(*arrays: npt.ArrayLike) -> np.dtype:
+    """Determines the floating-point type that the computations are carried
+    out in.
+
+    Args:
+        *arrays: Input arrays, e.g. resistances and applied voltages.
+
+    Returns:
+        Type of the arrays, promoted to at least single precision.
+    """
+    return np.result_type(*(np.asarray(array).dtype for array in arrays), np.float32)
+
+
+def word_line_bands(conductances: npt.NDArray, r_i) -> tuple[npt.NDArray, npt.NDArray]:
+    """Computes the entries of matrix `g` that couple the nodes on the same
+    word line.
+
+    Args:
+        conductances: Conductances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Diagonal entries of shape `m x n` and entries coupling neighbouring
+        nodes on the word lines of shape `m x (n-1)`.
+    """
+    g_i = segment_conductances(r_i.word_line, conductances.shape)
+    diagonal = conductances + g_i
+    diagonal[..., :-1] += g_i[..., 1:]
+    off_diagonal = -g_i[..., 1:]
+    return diagonal, off_diagonal
+
+
+def bit_line_bands(conductances: npt.NDArray, r_i) -> tuple[npt.NDArray, npt.NDArray]:
+    """Computes the entries of matrix `g` that couple the nodes on the same
+    bit line.
+
+    Args:
+        conductances: Conductances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Diagonal entries of shape `m x n` and entries coupling neighbouring
+        nodes on the bit lines of shape `(m-1) x n`.
+    """
+    g_bl = segment_conductances(r_i.bit_line, conductances.shape)
+    diagonal = conductances + g_bl
+    diagonal[..., 1:, :] += g_bl[..., :-1, :]
+    off_diagonal = -g_bl[..., :-1, :]
+    return diagonal, off_diagonal
+
+
+def coo_indices(shape: tuple[int, int], r_i) -> tuple[npt.NDArray, npt.NDArray]:
+    """Computes row and column indices of all non-zero entries of matrix `g`.
+
+    The order of the indices matches the order of the values returned by
+    `coo_values()`.
+
+    Args:
+        shape: Shape of the array of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Row and column indices.
+    """
+    size = shape[0] * shape[1]
+    rows, cols = [], []
+    if resistive(r_i.word_line):
+        idx = np.arange(size).reshape(shape)
+        rows += [idx.ravel(), idx[:, :-1].ravel(), idx[:, 1:].ravel()]
+        cols += [idx.ravel(), idx[:, 1:].ravel(), idx[:, :-1].ravel()]
+    if resistive(r_i.bit_line):
+        offset = size if resistive(r_i.word_line) else 0
+        idx = offset + np.arange(size).reshape(shape)
+        rows += [idx.ravel(), idx[:-1, :].ravel(), idx[1:, :].ravel()]
+        cols += [idx.ravel(), idx[1:, :].ravel(), idx[:-1, :].ravel()]
+    if resistive(r_i.word_line) and resistive(r_i.bit_line):
+        idx = np.arange(size)
+        rows += [idx, idx + size]
+        cols += [idx + size, idx]
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def coo_values(conductances: npt.NDArray, r_i) -> npt.NDArray:
+    """Computes the values of all non-zero entries of matrix `g`.
+
+    Values are computed by applying Kirchhoff's current law at the nodes on
+    the word and bit lines, without iterating over the lines.
+
+    Args:
+        conductances: Conductances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Values in the order of the indices returned by `coo_indices()`.
+    """
+    data = []
+    if resistive(r_i.word_line):
+        diagonal, off_diagonal = word_line_bands(conductances, r_i)
+        data += [diagonal.ravel(), off_diagonal.ravel(), off_diagonal.ravel()]
+    if resistive(r_i.bit_line):
+        diagonal, off_diagonal = bit_line_bands(conductances, r_i)
+        data += [diagonal.ravel(), off_diagonal.ravel(), off_diagonal.ravel()]
+    if resistive(r_i.word_line) and resistive(r_i.bit_line):
+        data += [-conductances.ravel(), -conductances.ravel()]
+    return np.concatenate(data)
@@ -0,0 +1,128 @@
+import logging
+from collections import namedtuple
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import kcl, solve
+
+logger = logging.getLogger(__name__)
+
+NewtonInfo = namedtuple("NewtonInfo", ["iterations", "updates"])
+
+DeviceFunction = Callable[[npt.NDArray, npt.NDArray], npt.NDArray]
+
+
+def v(
+    resistances: npt.NDArray,
+    r_i,
+    applied_voltages: npt.NDArray,
+    device_current: DeviceFunction,
+    device_conductance: DeviceFunction,
+    tol: float = 1e-9,
+    maxiter: int = 50,
+) -> tuple[npt.NDArray, NewtonInfo]:
+    """Solves nodal equations of a crossbar with nonlinear devices using
+    Newton's method.
+
+    In each iteration, every device is replaced by its differential
+    conductance in parallel with a current source, and the resulting linear
+    system is solved. Its matrix has the same structure as `g` of an ohmic
+    crossbar, only with different device conductances, so the systems of all
+    the examples are assembled from the cached sparsity pattern and solved
+    at once. Examples are dropped from the iterations as soon as they
+    converge.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+        device_current: Function that, given the voltages across the devices
+            (of shape `m x n x p`) and `resistances` (of shape `m x n x 1`),
+            returns the currents flowing through the devices.
+        device_conductance: Derivative of `device_current` with respect to
+            the voltage.
+        tol: Maximum change of node voltages in the last iteration for the
+            solution to be considered converged. It is raised to a few units
+            of rounding error of the largest applied voltage if it is
+            smaller, because single-precision changes never fall below that.
+        maxiter: Maximum number of iterations.
+
+    Returns:
+        Matrix containing potentials at each of the nodes and the number of
+        iterations and the maximum change of node voltages in the last
+        iteration for each example.
+    """
+    shape = resistances.shape + (applied_voltages.shape[1],)
+    size = resistances.size
+    num_examples = applied_voltages.shape[1]
+    dtype = kcl.float_dtype(resistances, applied_voltages)
+    tol = max(tol, 8 * np.finfo(dtype).eps * np.abs(applied_voltages).max(initial=0))
+    model_resistances = resistances[:, :, np.newaxis]
+    source_conductances = kcl.segment_conductances(r_i.word_line, resistances.shape)[:, [0]]
+
+    word_line_v = np.zeros(shape, dtype=dtype)
+    if not kcl.resistive(r_i.word_line):
+        word_line_v[...] = applied_voltages[:, np.newaxis, :]
+    bit_line_v = np.zeros(shape, dtype=dtype)
+
+    iterations = np.zeros(num_examples, dtype=int)
+    updates = np.zeros(num_examples)
+    active = (
+        np.arange(num_examples)
+        if kcl.resistive(r_i.word_line) or kcl.resistive(r_i.bit_line)
+        else []
+    )
+
+    logger.info("Started Newton iterations.")
+    for _ in range(maxiter):
+        if len(active) == 0:
+            break
+        w, b = word_line_v[..., active], bit_line_v[..., active]
+        v_diff = w - b
+        conductances = np.broadcast_to(device_conductance(v_diff, model_resistances), v_diff.shape)
+        offsets = device_current(v_diff, model_resistances) - conductances * v_diff
+
+        i_blocks = []
+        if kcl.resistive(r_i.word_line):
+            word_line_i = -offsets
+            word_line_i[:, 0] += applied_voltages[:, active] * source_conductances
+            i_blocks.append(word_line_i.reshape(size, -1))
+        if kcl.resistive(r_i.bit_line):
+            bit_line_i = offsets.copy()
+            if not kcl.resistive(r_i.word_line):
+                bit_line_i += conductances * w
+            i_blocks.append(bit_line_i.reshape(size, -1))
+        i = np.transpose(np.concatenate(i_blocks)).reshape(-1, 1)
+
+        with np.errstate(divide="ignore"):
+            linearized_resistances = 1.0 / np.moveaxis(conductances, 2, 0)
+        v_matrix = solve.solve_batch(linearized_resistances, r_i, i)
+        v_matrix = np.transpose(v_matrix.reshape(len(active), -1))
+
+        step = np.zeros(len(active), dtype=dtype)
+        if kcl.resistive(r_i.word_line):
+            new_w = v_matrix[:size].reshape(w.shape)
+            step = np.maximum(step, np.max(np.abs(new_w - w), axis=(0, 1)))
+            word_line_v[..., active] = new_w
+        if kcl.resistive(r_i.bit_line):
+            new_b = v_matrix[-size:].reshape(b.shape)
+            step = np.maximum(step, np.max(np.abs(new_b - b), axis=(0, 1)))
+            bit_line_v[..., active] = new_b
+
+        iterations[active] += 1
+        updates[active] = step
+        active = active[step > tol]
+
+    if len(active) > 0:
+        logger.warning(
+            f"Newton's method did not converge for {len(active)} example(s) after {maxiter} "
+            f"iterations (maximum change of node voltages {updates.max():.3g} V)."
+        )
+    logger.info(
+        f"Newton's method used at most {iterations.max(initial=0)} iterations; maximum change "
+        f"of node voltages in the last iteration is {updates.max(initial=0):.3g} V."
+    )
+
+    v_matrix = np.concatenate((word_line_v.reshape(size, -1), bit_line_v.reshape(size, -1)))
+    return v_matrix, NewtonInfo(iterations, updates)
@@ -0,0 +1,103 @@
+import functools
+from collections import namedtuple
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import kcl
+
+Pattern = namedtuple("Pattern", ["shape", "indices", "indptr", "order"])
+NonZero = namedtuple("NonZero", ["word_line", "bit_line"])
+
+DEFAULT_CACHE_SIZE = 32
+
+
+def get(shape: tuple[int, int], r_i) -> Pattern:
+    """Returns the sparsity pattern of matrix `g`.
+
+    Patterns are cached, keyed by the shape of the crossbar and by which of
+    the interconnect resistances are zero, so that only the values of the
+    non-zero entries have to be recomputed when the same crossbar geometry is
+    simulated repeatedly.
+
+    Args:
+        shape: Shape of the array of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Sparsity pattern of matrix `g` in CSC format. Field `order` contains
+        the permutation that sorts the values returned by `kcl.coo_values()`
+        into CSC order.
+    """
+    return _cached_pattern(tuple(shape), kcl.resistive(r_i.word_line), kcl.resistive(r_i.bit_line))
+
+
+def values(g_pattern: Pattern, conductances: npt.NDArray, r_i) -> npt.NDArray:
+    """Computes the values of the non-zero entries of matrix `g` in CSC order.
+
+    Args:
+        g_pattern: Sparsity pattern of matrix `g`.
+        conductances: Conductances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Values of the non-zero entries.
+    """
+    return kcl.coo_values(conductances, r_i)[g_pattern.order]
+
+
+def cache_info():
+    """Returns statistics of the sparsity pattern cache.
+
+    Returns:
+        Named tuple with fields `hits`, `misses`, `maxsize` and `currsize`.
+    """
+    return _cached_pattern.cache_info()
+
+
+def cache_clear():
+    """Removes all sparsity patterns from the cache."""
+    _cached_pattern.cache_clear()
+
+
+def set_cache_size(maxsize: int):
+    """Changes the maximum number of sparsity patterns kept in the cache.
+
+    Least recently used patterns are evicted once the cache is full. Changing
+    the size clears the cache.
+
+    Args:
+        maxsize: Maximum number of cached patterns. If None, the cache can
+            grow without bound.
+    """
+    global _cached_pattern
+    _cached_pattern = functools.lru_cache(maxsize=maxsize)(_build_pattern)
+
+
+def _build_pattern(shape: tuple[int, int], word_line: bool, bit_line: bool) -> Pattern:
+    """Builds the sparsity pattern of matrix `g`.
+
+    Args:
+        shape: Shape of the array of crossbar devices.
+        word_line: Whether the interconnect resistance of the word line
+            segments is non-zero.
+        bit_line: Whether the interconnect resistance of the bit line segments
+            is non-zero.
+
+    Returns:
+        Sparsity pattern of matrix `g` in CSC format.
+    """
+    rows, cols = kcl.coo_indices(shape, NonZero(int(word_line), int(bit_line)))
+    size = shape[0] * shape[1]
+    if word_line and bit_line:
+        size *= 2
+    index_dtype = np.int32 if rows.size < np.iinfo(np.int32).max else np.int64
+    order = np.lexsort((rows, cols))
+    indices = rows[order].astype(index_dtype)
+    indptr = np.zeros(size + 1, dtype=index_dtype)
+    np.cumsum(np.bincount(cols, minlength=size), out=indptr[1:])
+    for array in (indices, indptr, order):
+        array.setflags(write=False)
+    return Pattern(shape, indices, indptr, order)
+
+
+_cached_pattern = functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)(_build_pattern)
@@ -0,0 +1,194 @@
+import logging
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import iterative, kcl, tridiagonal
+
+logger = logging.getLogger(__name__)
+
+
+class SchurSolver:
+    """Solves equation `gv = i` by eliminating the nodes on the bit lines.
+
+    Matrix `g` can be written as `[[A, -C], [-C, B]]`, where `A` and `B`
+    contain independent tridiagonal blocks for each word and bit line,
+    respectively, and `C` is a diagonal matrix of device conductances. The
+    bit line potentials are eliminated using batched tridiagonal solves,
+    which leaves the Schur complement `S = A - C B^-1 C` of half the size.
+    `S` is symmetric positive definite and is never formed explicitly;
+    instead, preconditioned conjugate gradient method is applied to all the
+    examples at once, and the potentials on the bit lines are recovered by
+    back-substitution.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+            Both of them must be non-zero.
+        tol: Relative tolerance of the residual of the reduced system.
+        maxiter: Maximum number of iterations. If None, it is set to ten
+            times the number of word line nodes.
+    """
+
+    def __init__(self, resistances: npt.NDArray, r_i, tol: float = 1e-10, maxiter: int = None):
+        with np.errstate(divide="ignore"):
+            self.conductances = 1.0 / resistances
+        self.shape = resistances.shape
+        self.size = resistances.size
+        self.tol = tol
+        self.maxiter = maxiter if maxiter is not None else 10 * self.size
+        self.info = None
+
+        self.a_diagonal, self.a_off_diagonal = kcl.word_line_bands(self.conductances, r_i)
+        b_diagonal, b_off_diagonal = kcl.bit_line_bands(self.conductances, r_i)
+        self.b_factorization = tridiagonal.factorize(
+            b_off_diagonal.T, b_diagonal.T, b_off_diagonal.T
+        )
+
+        # `A` with its diagonal reduced by the diagonal approximation of
+        # `C B^-1 C` remains diagonally dominant and serves as a tridiagonal
+        # preconditioner of `S`.
+        preconditioner_diagonal = self.a_diagonal - self.conductances**2 / b_diagonal
+        self.preconditioner = tridiagonal.factorize(
+            self.a_off_diagonal, preconditioner_diagonal, self.a_off_diagonal
+        )
+
+    def __call__(self, i: npt.NDArray) -> npt.NDArray:
+        """Solves equation `gv = i` and stores the statistics in `info`.
+
+        Args:
+            i: Matrix `i` used in equation `gv = i`.
+
+        Returns:
+            Matrix containing potentials at each of the nodes.
+        """
+        v_matrix, self.info = self.solve(i)
+        return v_matrix
+
+    def solve(self, i: npt.NDArray) -> tuple[npt.NDArray, iterative.SolverInfo]:
+        """Solves equation `gv = i`.
+
+        Args:
+            i: Matrix `i` used in equation `gv = i`.
+
+        Returns:
+            Matrix containing potentials at each of the nodes and the number
+            of iterations and relative residual for each example.
+        """
+        i = i.reshape(i.shape[0], -1)
+        i_w, i_b = i[: self.size], i[self.size :]
+        c = self.conductances.reshape(self.size, 1)
+
+        rhs = i_w + c * self.b_solve(i_b)
+        v_w, info = self.conjugate_gradient(rhs)
+        v_b = self.b_solve(i_b + c * v_w)
+
+        return np.concatenate((v_w, v_b)), info
+
+    def b_solve(self, x: npt.NDArray) -> npt.NDArray:
+        """Solves the tridiagonal systems of all bit lines.
+
+        Args:
+            x: Right-hand sides of shape `mn x p`.
+
+        Returns:
+            Solutions of shape `mn x p`.
+        """
+        x = x.reshape(self.shape + (-1,)).transpose(1, 0, 2)
+        y = tridiagonal.solve(self.b_factorization, x)
+        return y.transpose(1, 0, 2).reshape(self.size, -1)
+
+    def a_multiply(self, x: npt.NDArray) -> npt.NDArray:
+        """Multiplies block `A` of matrix `g` by a vector.
+
+        Args:
+            x: Vectors of shape `mn x p`.
+
+        Returns:
+            Products of shape `mn x p`.
+        """
+        x = x.reshape(self.shape + (-1,))
+        y = self.a_diagonal[:, :, np.newaxis] * x
+        y[:, :-1] += self.a_off_diagonal[:, :, np.newaxis] * x[:, 1:]
+        y[:, 1:] += self.a_off_diagonal[:, :, np.newaxis] * x[:, :-1]
+        return y.reshape(self.size, -1)
+
+    def s_multiply(self, x: npt.NDArray) -> npt.NDArray:
+        """Multiplies Schur complement `S` by a vector.
+
+        Args:
+            x: Vectors of shape `mn x p`.
+
+        Returns:
+            Products of shape `mn x p`.
+        """
+        c = self.conductances.reshape(self.size, 1)
+        return self.a_multiply(x) - c * self.b_solve(c * x)
+
+    def precondition(self, x: npt.NDArray) -> npt.NDArray:
+        """Applies the preconditioner of `S`.
+
+        Args:
+            x: Vectors of shape `mn x p`.
+
+        Returns:
+            Preconditioned vectors of shape `mn x p`.
+        """
+        y = tridiagonal.solve(self.preconditioner, x.reshape(self.shape + (-1,)))
+        return y.reshape(self.size, -1)
+
+    def conjugate_gradient(self, rhs: npt.NDArray) -> tuple[npt.NDArray, iterative.SolverInfo]:
+        """Solves `Sx = rhs` for all examples simultaneously.
+
+        Args:
+            rhs: Right-hand sides of shape `mn x p`.
+
+        Returns:
+            Solutions of shape `mn x p` and the number of iterations and
+            relative residual for each example.
+        """
+        num_examples = rhs.shape[1]
+        rhs_norm = np.linalg.norm(rhs, axis=0)
+        rhs_norm[rhs_norm == 0] = 1.0
+
+        x = np.zeros(rhs.shape, dtype=rhs.dtype)
+        r = rhs.copy()
+        z = self.precondition(r)
+        p = z.copy()
+        rz = np.sum(r * z, axis=0)
+        residuals = np.linalg.norm(r, axis=0) / rhs_norm
+        iterations = np.zeros(num_examples, dtype=int)
+        active = residuals > self.tol
+
+        for _ in range(self.maxiter):
+            if not active.any():
+                break
+            q = self.s_multiply(p)
+            pq = np.sum(p * q, axis=0)
+            alpha = np.divide(
+                rz, pq, out=np.zeros(num_examples, dtype=rhs.dtype), where=active & (pq != 0)
+            )
+            x += alpha * p
+            r -= alpha * q
+            iterations += active
+            residuals = np.linalg.norm(r, axis=0) / rhs_norm
+            active &= residuals > self.tol
+
+            z = self.precondition(r)
+            rz_new = np.sum(r * z, axis=0)
+            beta = np.divide(
+                rz_new, rz, out=np.zeros(num_examples, dtype=rhs.dtype), where=active & (rz != 0)
+            )
+            p = z + beta * p
+            rz = rz_new
+
+        if active.any():
+            logger.warning(
+                f"Schur complement solver did not converge for {active.sum()} example(s) after "
+                f"{self.maxiter} iterations (maximum relative residual {residuals.max():.3g})."
+            )
+
+        logger.info(
+            f"Schur complement solver used at most {iterations.max()} iterations; "
+            f"maximum relative residual is {residuals.max():.3g}."
+        )
+        return x, iterative.SolverInfo(iterations, residuals)
@@ -1,60 +1,307 @@
+import concurrent.futures
 import logging
+from typing import Callable, Optional
 
 import numpy as np
 import numpy.typing as npt
-from badcrossbar.computing import fill
+from badcrossbar.computing import fill, iterative, kcl, schur, tridiagonal
 from scipy.sparse import linalg
 
 logger = logging.getLogger(__name__)
 
 
-def v(resistances: npt.NDArray, r_i, applied_voltages: npt.NDArray):
-    """Solves matrix equation `gv = i`.
+def v(resistances: npt.NDArray, r_i, applied_voltages: npt.NDArray, **kwargs):
+    """Solves matrix equation `gv = i` and adds known node potentials.
 
     Args:
         resistances: Resistances of crossbar devices.
         r_i: Interconnect resistances along the word and bit line segments.
         applied_voltages: Applied voltages.
+        **kwargs: Keyword arguments of `unknown_v()`.
 
     Returns:
         Matrix containing potentials at each of the nodes.
     """
-    if r_i.word_line > 0 or r_i.bit_line > 0:
-        g = fill.g(resistances, r_i)
-        i = fill.i(applied_voltages, resistances, r_i)
+    v_matrix = unknown_v(resistances, r_i, applied_voltages, **kwargs)
+    return expand(v_matrix, resistances, r_i, applied_voltages)
+
+
+def unknown_v(
+    resistances: npt.NDArray, r_i, applied_voltages: npt.NDArray, **kwargs
+) -> Optional[npt.NDArray]:
+    """Solves matrix equation `gv = i`.
+
+    Only the nodes on the lines with non-zero interconnect resistance are
+    included in the system.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+        **factorization: Function returned by `factorize()` for the same
+            resistances. If passed, matrix `g` is neither assembled nor
+            factorized again.
+        **solver: Solver used if `factorization` is not passed. One of
+            {`"direct"`, `"cg"`, `"minres"`, `"schur"`}.
+        **tol: Relative tolerance of the iterative solvers.
+        **maxiter: Maximum number of iterations of the iterative solvers.
+        **preconditioner: Preconditioner of the iterative solvers.
+        **block_size: If passed, matrix `g` is factorized once and the
+            examples are solved for in blocks of this many columns, so that
+            only the corresponding blocks of matrix `i` are held in memory.
+        **workers: Number of threads solving for the blocks of examples
+            concurrently.
+
+    Returns:
+        Matrix containing potentials at the nodes on the word lines (if
+        `r_i.word_line > 0`) followed by the ones on the bit lines (if
+        `r_i.bit_line > 0`). None if both interconnect resistances are zero.
+    """
+    if kcl.resistive(r_i.word_line) or kcl.resistive(r_i.bit_line):
+        factorization = kwargs.get("factorization")
+        block_size = kwargs.get("block_size")
+        if factorization is None and (
+            kwargs.get("solver", "direct") != "direct"
+            or kcl.ideal_lines(r_i)
+            or block_size is not None
+        ):
+            factorization = factorize(resistances, r_i, **kwargs)
 
         logger.info("Started solving for v.")
-        v_matrix = linalg.spsolve(g.tocsc(), i)
+        if block_size is not None:
+            v_matrix = solve_blocks(
+                factorization,
+                resistances,
+                r_i,
+                applied_voltages,
+                block_size,
+                kwargs.get("workers", 1),
+            )
+        else:
+            i = fill.i(applied_voltages, resistances, r_i)
+            if factorization is None:
+                g = fill.g(resistances, r_i)
+                v_matrix = linalg.spsolve(g.tocsc(), i)
+            else:
+                v_matrix = factorization(i)
         logger.info("Solved for v.")
 
         # if `num_examples == 1`, it can result in 1D array.
         if v_matrix.ndim == 1:
             v_matrix = v_matrix.reshape(v_matrix.shape[0], 1)
-
-        # if one of the interconnect resistances is zero, only half of the
-        # matrix_v had to be solved. The other half can be filled without
-        # solving because the node voltages are known.
-        if r_i.word_line == 0:
-            new_v_matrix = np.zeros((2 * resistances.size, applied_voltages.shape[1]))
-            new_v_matrix[
-                : resistances.size,
-            ] = np.repeat(applied_voltages, resistances.shape[1], axis=0)
-            new_v_matrix[
-                resistances.size :,
-            ] = v_matrix
-            v_matrix = new_v_matrix
-        if r_i.bit_line == 0:
-            new_v_matrix = np.zeros((2 * resistances.size, applied_voltages.shape[1]))
-            new_v_matrix[
-                : resistances.size,
-            ] = v_matrix
-            v_matrix = new_v_matrix
     else:
-        # if both interconnect resistances are zero, all node voltages are
-        # known.
-        v_matrix = np.zeros((2 * resistances.size, applied_voltages.shape[1]))
-        v_matrix[
-            : resistances.size,
-        ] = np.repeat(applied_voltages, resistances.shape[1], axis=0)
+        v_matrix = None
 
     return v_matrix
+
+
+def solve_blocks(
+    factorization: Callable[[npt.NDArray], npt.NDArray],
+    resistances: npt.NDArray,
+    r_i,
+    applied_voltages: npt.NDArray,
+    block_size: int,
+    workers: int = 1,
+) -> npt.NDArray:
+    """Solves matrix equation `gv = i` for blocks of examples concurrently.
+
+    Triangular solves release the GIL, so the blocks are distributed among a
+    pool of threads sharing the same factorization.
+
+    Args:
+        factorization: Function returned by `factorize()`.
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+        block_size: Number of examples in each block.
+        workers: Number of threads.
+
+    Returns:
+        Solution of `gv = i` for all the examples.
+    """
+    num_examples = applied_voltages.shape[1]
+    num_nodes = kcl.num_nodes(resistances.size, r_i)
+    starts = range(0, num_examples, block_size)
+    v_matrix = np.empty(
+        (num_nodes, num_examples), dtype=kcl.float_dtype(applied_voltages, resistances)
+    )
+    infos = [None] * len(starts)
+
+    def solve_block(idx: int):
+        examples = slice(starts[idx], starts[idx] + block_size)
+        i = fill.i(applied_voltages[:, examples], resistances, r_i)
+        if isinstance(factorization, (iterative.IterativeSolver, schur.SchurSolver)):
+            v_block, infos[idx] = factorization.solve(i)
+        else:
+            v_block = factorization(i)
+        v_matrix[:, examples] = v_block.reshape(num_nodes, -1)
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        list(executor.map(solve_block, range(len(starts))))
+
+    if infos[0] is not None:
+        factorization.info = iterative.SolverInfo(*(np.concatenate(field) for field in zip(*infos)))
+
+    return v_matrix
+
+
+def v_batch(resistances: npt.NDArray, r_i, applied_voltages: npt.NDArray, **kwargs):
+    """Solves matrix equations `gv = i` of multiple crossbars at once.
+
+    Args:
+        resistances: Resistances of crossbar devices of shape `k x m x n`,
+            where `k` is the number of crossbars.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages of shape `k x m x p`.
+
+    Returns:
+        Array of shape `k x 2mn x p` containing potentials at each of the nodes
+        of each crossbar.
+    """
+    num_crossbars = resistances.shape[0]
+    if kcl.resistive(r_i.word_line) or kcl.resistive(r_i.bit_line):
+        i = np.concatenate(
+            [fill.i(applied_voltages[idx], resistances[idx], r_i) for idx in range(num_crossbars)]
+        )
+
+        logger.info(f"Started solving for v of {num_crossbars} crossbars.")
+        v_matrix = solve_batch(resistances, r_i, i)
+        logger.info(f"Solved for v of {num_crossbars} crossbars.")
+
+        v_matrix = v_matrix.reshape(num_crossbars, -1, applied_voltages.shape[2])
+    else:
+        v_matrix = [None] * num_crossbars
+
+    return np.stack(
+        [
+            expand(v_matrix[idx], resistances[idx], r_i, applied_voltages[idx])
+            for idx in range(num_crossbars)
+        ]
+    )
+
+
+def solve_batch(resistances: npt.NDArray, r_i, i: npt.NDArray) -> npt.NDArray:
+    """Solves matrix equations `gv = i` of multiple crossbars at once.
+
+    Args:
+        resistances: Resistances of crossbar devices of shape `k x m x n`,
+            where `k` is the number of crossbars.
+        r_i: Interconnect resistances along the word and bit line segments.
+        i: Matrices `i` of all the crossbars concatenated along the first
+            axis.
+
+    Returns:
+        Solutions of `gv = i` concatenated along the first axis.
+    """
+    if kcl.ideal_lines(r_i):
+        with np.errstate(divide="ignore"):
+            conductances = 1.0 / resistances
+        return tridiagonal.line_solver(conductances, r_i)(i)
+
+    g = fill.g_batch(resistances, r_i)
+    return linalg.spsolve(g, i).reshape(i.shape)
+
+
+def expand(
+    v_matrix: Optional[npt.NDArray], resistances: npt.NDArray, r_i, applied_voltages: npt.NDArray
+) -> npt.NDArray:
+    """Adds known node potentials to the solution of `gv = i`.
+
+    Args:
+        v_matrix: Solution of `gv = i`. None if no system had to be solved.
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        applied_voltages: Applied voltages.
+
+    Returns:
+        Matrix containing potentials at each of the nodes.
+    """
+    if kcl.resistive(r_i.word_line) and kcl.resistive(r_i.bit_line):
+        return v_matrix
+
+    # if one of the interconnect resistances is zero, only half of the
+    # matrix_v had to be solved. The other half can be filled without solving
+    # because the node voltages are known. If both interconnect resistances
+    # are zero, all node voltages are known.
+    new_v_matrix = np.zeros(
+        (2 * resistances.size, applied_voltages.shape[1]),
+        dtype=kcl.float_dtype(applied_voltages, resistances),
+    )
+    if not kcl.resistive(r_i.word_line):
+        new_v_matrix[: resistances.size] = np.repeat(applied_voltages, resistances.shape[1], axis=0)
+    elif v_matrix is not None:
+        new_v_matrix[: resistances.size] = v_matrix
+    if kcl.resistive(r_i.bit_line):
+        new_v_matrix[resistances.size :] = v_matrix
+
+    return new_v_matrix
+
+
+def factorize(
+    resistances: npt.NDArray, r_i, **kwargs
+) -> Optional[Callable[[npt.NDArray], npt.NDArray]]:
+    """Computes LU factorization of matrix `g` used in equation `gv = i`.
+
+    If one of the interconnect resistances is zero, matrix `g` consists of
+    independent tridiagonal systems, one for each line, and so it is
+    factorized without being assembled. If an iterative solver is chosen, only
+    its preconditioner is computed.
+
+    Args:
+        resistances: Resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+        **solver: One of {`"direct"`, `"cg"`, `"minres"`, `"schur"`}.
+            `"schur"` eliminates the nodes on the bit lines and solves the
+            remaining system for the nodes on the word lines iteratively.
+        **tol: Relative tolerance of the iterative solvers.
+        **maxiter: Maximum number of iterations of the iterative solvers.
+        **preconditioner: Preconditioner of the iterative solvers. One of
+            {`"line"`, `"jacobi"`, `"ilu"`}, None or a linear operator.
+            `"line"` solves the tridiagonal systems of all the word and bit
+            lines, neglecting the coupling through the devices.
+
+    Returns:
+        Function that solves `gv = i` for a given matrix `i`. None if no
+        system has to be solved, i.e. when both interconnect resistances are
+        zero or both are infinite.
+    """
+    if not (kcl.resistive(r_i.word_line) or kcl.resistive(r_i.bit_line)) or kcl.insulating(r_i):
+        return None
+
+    solver = kwargs.get("solver", "direct")
+    if solver == "schur":
+        if kcl.resistive(r_i.word_line) and kcl.resistive(r_i.bit_line):
+            return schur.SchurSolver(
+                resistances, r_i, tol=kwargs.get("tol", 1e-10), maxiter=kwargs.get("maxiter")
+            )
+        # with one of the interconnect resistances being zero, only one set of
+        # nodes is solved for in the first place.
+        solver = "direct"
+
+    if solver == "direct" and kcl.ideal_lines(r_i):
+        logger.info("Started factorizing tridiagonal systems of the lines.")
+        with np.errstate(divide="ignore"):
+            conductances = 1.0 / resistances
+        solve_lines = tridiagonal.line_solver(conductances, r_i)
+        logger.info("Factorized tridiagonal systems of the lines.")
+        return solve_lines
+
+    g = fill.g(resistances, r_i)
+    if solver in iterative.METHODS:
+        preconditioner = kwargs.get("preconditioner", "line")
+        if isinstance(preconditioner, str) and preconditioner == "line":
+            preconditioner = iterative.line_preconditioner(resistances, r_i)
+        return iterative.IterativeSolver(
+            g,
+            method=solver,
+            tol=kwargs.get("tol", 1e-10),
+            maxiter=kwargs.get("maxiter"),
+            preconditioner=preconditioner,
+        )
+    if solver != "direct":
+        raise ValueError(f'Solver "{solver}" is not supported!')
+
+    logger.info("Started factorizing g.")
+    lu = linalg.splu(g.tocsc())
+    logger.info("Factorized g.")
+    return lu.solve
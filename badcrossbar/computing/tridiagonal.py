@@ -0,0 +1,116 @@
+from collections import namedtuple
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import kcl
+
+Factorization = namedtuple("Factorization", ["lower", "inverse_pivots", "upper"])
+
+
+def factorize(lower: npt.NDArray, diagonal: npt.NDArray, upper: npt.NDArray) -> Factorization:
+    """Computes LU factorization of a batch of tridiagonal matrices.
+
+    All the matrices are factorized simultaneously, iterating only along the
+    length of the lines (Thomas algorithm).
+
+    Args:
+        lower: Subdiagonal entries of shape `b x (k-1)`, where `b` is the
+            number of matrices and `k` is the size of each of them.
+        diagonal: Diagonal entries of shape `b x k`.
+        upper: Superdiagonal entries of shape `b x (k-1)`.
+
+    Returns:
+        Factorization that can be passed to `solve()`.
+    """
+    size = diagonal.shape[-1]
+    inverse_pivots = np.empty(diagonal.shape, dtype=diagonal.dtype)
+    scaled_upper = np.empty(upper.shape, dtype=np.result_type(upper, diagonal))
+    inverse_pivots[:, 0] = 1.0 / diagonal[:, 0]
+    for idx in range(1, size):
+        scaled_upper[:, idx - 1] = upper[:, idx - 1] * inverse_pivots[:, idx - 1]
+        inverse_pivots[:, idx] = 1.0 / (
+            diagonal[:, idx] - lower[:, idx - 1] * scaled_upper[:, idx - 1]
+        )
+    return Factorization(lower, inverse_pivots, scaled_upper)
+
+
+def solve(factorization: Factorization, rhs: npt.NDArray) -> npt.NDArray:
+    """Solves a batch of tridiagonal systems.
+
+    Args:
+        factorization: Factorization returned by `factorize()`.
+        rhs: Right-hand sides of shape `b x k x p`, where `p` is the number of
+            examples.
+
+    Returns:
+        Solutions of shape `b x k x p`.
+    """
+    lower, inverse_pivots, scaled_upper = factorization
+    size = inverse_pivots.shape[-1]
+    x = np.empty(
+        np.broadcast_shapes(rhs.shape, inverse_pivots.shape + (1,)),
+        dtype=np.result_type(rhs, inverse_pivots),
+    )
+    x[:, 0] = rhs[:, 0] * inverse_pivots[:, [0]]
+    for idx in range(1, size):
+        x[:, idx] = (rhs[:, idx] - lower[:, [idx - 1]] * x[:, idx - 1]) * inverse_pivots[:, [idx]]
+    for idx in range(size - 2, -1, -1):
+        x[:, idx] -= scaled_upper[:, [idx]] * x[:, idx + 1]
+    return x
+
+
+def line_solver(conductances: npt.NDArray, r_i) -> Callable[[npt.NDArray], npt.NDArray]:
+    """Factorizes the tridiagonal systems of all the word and bit lines.
+
+    Only the lines with non-zero interconnect resistance are included, and
+    the coupling between the word and bit lines through the devices is
+    neglected. When one of the interconnect resistances is zero, matrix `g`
+    consists of these systems only, and so they can be solved exactly.
+
+    Args:
+        conductances: Conductances of crossbar devices. If the array has more
+            than two dimensions, the leading ones index independent crossbars.
+        r_i: Interconnect resistances along the word and bit line segments.
+
+    Returns:
+        Function that solves the systems for a given matrix of shape `N x p`,
+        where `N` is the number of nodes on the lines with non-zero
+        interconnect resistance.
+    """
+    shape = conductances.shape
+    size = conductances.size
+    num_word_lines, num_bit_lines = shape[-2:]
+
+    blocks = []
+    if kcl.resistive(r_i.word_line):
+        diagonal, off_diagonal = kcl.word_line_bands(conductances, r_i)
+        num_lines = size // num_bit_lines
+        diagonal = diagonal.reshape(num_lines, num_bit_lines)
+        off_diagonal = off_diagonal.reshape(num_lines, num_bit_lines - 1)
+        blocks.append((False, factorize(off_diagonal, diagonal, off_diagonal)))
+    if kcl.resistive(r_i.bit_line):
+        # nodes on the same bit line are `n` positions apart, so bit lines are
+        # transposed to make them contiguous.
+        diagonal, off_diagonal = kcl.bit_line_bands(conductances, r_i)
+        num_lines = size // num_word_lines
+        diagonal = np.swapaxes(diagonal, -2, -1).reshape(num_lines, num_word_lines)
+        off_diagonal = np.swapaxes(off_diagonal, -2, -1).reshape(num_lines, num_word_lines - 1)
+        blocks.append((True, factorize(off_diagonal, diagonal, off_diagonal)))
+
+    def solve_lines(rhs: npt.NDArray) -> npt.NDArray:
+        rhs = rhs.reshape(len(blocks) * size, -1)
+        x = np.empty(rhs.shape, dtype=np.result_type(rhs, conductances))
+        for idx, (transposed, factorization) in enumerate(blocks):
+            rhs_block = rhs[idx * size : (idx + 1) * size].reshape(shape + (-1,))
+            if transposed:
+                rhs_block = np.swapaxes(rhs_block, -3, -2)
+            line_shape = rhs_block.shape
+            x_block = solve(factorization, rhs_block.reshape((-1,) + line_shape[-2:]))
+            x_block = x_block.reshape(line_shape)
+            if transposed:
+                x_block = np.swapaxes(x_block, -3, -2)
+            x[idx * size : (idx + 1) * size] = x_block.reshape(size, -1)
+        return x
+
+    return solve_lines
@@ -0,0 +1,110 @@
+import logging
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+from badcrossbar.computing import kcl
+from scipy import linalg
+
+logger = logging.getLogger(__name__)
+
+
+class LowRankFactorization:
+    """Solves equation `gv = i` after the resistances of a few devices have
+    changed, without factorizing `g` again.
+
+    Changing the conductance of a single device adds a rank-one term to `g`,
+    so the new solution is obtained from the solution of the original
+    system using Sherman-Morrison-Woodbury formula. Only `k` additional
+    solves are needed in advance, where `k` is the number of changed devices.
+
+    Args:
+        factorization: Function returned by `solve.factorize()` for the
+            original resistances.
+        original_resistances: Resistances that `factorization` was computed
+            for.
+        resistances: New resistances of crossbar devices.
+        r_i: Interconnect resistances along the word and bit line segments.
+    """
+
+    def __init__(
+        self,
+        factorization: Callable[[npt.NDArray], npt.NDArray],
+        original_resistances: npt.NDArray,
+        resistances: npt.NDArray,
+        r_i,
+    ):
+        self.factorization = factorization
+        self.dtype = kcl.float_dtype(resistances)
+        self.devices = np.flatnonzero(resistances != original_resistances)
+        self.num_nodes = kcl.num_nodes(resistances.size, r_i)
+        with np.errstate(divide="ignore"):
+            self.conductance_changes = (
+                1.0 / resistances.ravel()[self.devices]
+                - 1.0 / original_resistances.ravel()[self.devices]
+            )
+
+        # each change adds `dG u u^T` to `g`, where `u` is +1 at the node on
+        # the word line and -1 at the node on the bit line (if they are not
+        # eliminated).
+        self.word_line_nodes = self.devices if kcl.resistive(r_i.word_line) else None
+        if kcl.resistive(r_i.bit_line):
+            offset = resistances.size if kcl.resistive(r_i.word_line) else 0
+            self.bit_line_nodes = offset + self.devices
+        else:
+            self.bit_line_nodes = None
+
+        logger.info(f"Started low-rank update of g for {self.devices.size} device(s).")
+        u = self.expand(np.eye(self.devices.size, dtype=self.dtype))
+        self.z = self.factorization(u).reshape(self.num_nodes, -1)
+        capacitance = np.eye(self.devices.size, dtype=self.dtype)
+        capacitance += self.conductance_changes[:, np.newaxis] * self.project(self.z)
+        self.capacitance = linalg.lu_factor(capacitance)
+        logger.info("Updated factorization of g.")
+
+    def __call__(self, i: npt.NDArray) -> npt.NDArray:
+        """Solves equation `gv = i` for the new resistances.
+
+        Args:
+            i: Matrix `i` used in equation `gv = i`.
+
+        Returns:
+            Matrix containing potentials at each of the nodes.
+        """
+        v_matrix = self.factorization(i).reshape(self.num_nodes, -1)
+        correction = linalg.lu_solve(
+            self.capacitance, self.conductance_changes[:, np.newaxis] * self.project(v_matrix)
+        )
+        return v_matrix - self.z @ correction
+
+    def project(self, x: npt.NDArray) -> npt.NDArray:
+        """Multiplies matrix `x` by `U^T`.
+
+        Args:
+            x: Matrix of shape `N x p`.
+
+        Returns:
+            Voltage differences across the changed devices of shape `k x p`.
+        """
+        y = np.zeros((self.devices.size, x.shape[1]), dtype=self.dtype)
+        if self.word_line_nodes is not None:
+            y += x[self.word_line_nodes]
+        if self.bit_line_nodes is not None:
+            y -= x[self.bit_line_nodes]
+        return y
+
+    def expand(self, x: npt.NDArray) -> npt.NDArray:
+        """Multiplies matrix `x` by `U`.
+
+        Args:
+            x: Matrix of shape `k x p`.
+
+        Returns:
+            Matrix of shape `N x p`.
+        """
+        y = np.zeros((self.num_nodes, x.shape[1]), dtype=self.dtype)
+        if self.word_line_nodes is not None:
+            y[self.word_line_nodes] += x
+        if self.bit_line_nodes is not None:
+            y[self.bit_line_nodes] -= x
+        return y
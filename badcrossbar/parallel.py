@@ -0,0 +1,247 @@
+import collections
+import concurrent.futures
+import itertools
+import logging
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from multiprocessing import shared_memory
+from typing import Any, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from badcrossbar import check, computing, utils
+from badcrossbar.compute import compute
+
+logger = logging.getLogger(__name__)
+
+POSITIONAL_ARGUMENTS = ("applied_voltages", "resistances", "r_i", "r_i_word_line", "r_i_bit_line")
+
+
+def imap(
+    jobs: Iterable[Union[Mapping[str, Any], tuple]], workers: int = None, chunksize: int = 1
+) -> Iterator[computing.Solution]:
+    """Computes branch currents and node voltages of independent crossbars in
+    parallel.
+
+    Simulations are distributed among a pool of processes. Resistances,
+    applied voltages and the results are transferred through shared memory,
+    so large arrays are never pickled. At most two chunks of jobs per worker
+    are in flight at any time, which bounds memory usage for long iterables.
+
+    Args:
+        jobs: Arguments of `badcrossbar.compute()` for each simulation, either
+            as dicts (which may also contain optional keyword arguments, such
+            as `all_currents`) or as tuples of positional arguments.
+        workers: Number of worker processes. If None, the number of CPUs is
+            used.
+        chunksize: Number of jobs sent to a worker at once.
+
+    Yields:
+        Branch currents and node voltages of the crossbars, in the same format
+        as returned by `badcrossbar.compute()` and in the order of `jobs`.
+    """
+    workers = workers or os.cpu_count()
+    job_iterator = iter(jobs)
+    pending = collections.deque()
+
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, initializer=_initialize_worker
+    ) as executor:
+        try:
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = []
+                    try:
+                        for job in itertools.islice(job_iterator, chunksize):
+                            chunk.append(_Job(job))
+                    except Exception:
+                        for job in chunk:
+                            job.release()
+                        raise
+                    if not chunk:
+                        break
+                    future = executor.submit(_run, [job.descriptor for job in chunk])
+                    pending.append((future, chunk))
+                if not pending:
+                    break
+
+                future, chunk = pending.popleft()
+                try:
+                    available = future.result()
+                    solutions = [job.solution(fields) for job, fields in zip(chunk, available)]
+                finally:
+                    for job in chunk:
+                        job.release()
+                yield from solutions
+        finally:
+            for future, chunk in pending:
+                future.cancel()
+                for job in chunk:
+                    job.release()
+
+
+class _Job:
+    """Single simulation whose inputs and outputs reside in shared memory.
+
+    Args:
+        job: Arguments of `badcrossbar.compute()`.
+    """
+
+    def __init__(self, job: Union[Mapping[str, Any], tuple]):
+        if isinstance(job, Mapping):
+            arguments = dict(job)
+        else:
+            arguments = dict(zip(POSITIONAL_ARGUMENTS, job))
+        arguments.setdefault("node_voltages", True)
+        arguments.setdefault("all_currents", True)
+
+        r_i = arguments.get("r_i")
+        r_i_word_line = r_i if r_i is not None else arguments.get("r_i_word_line")
+        r_i_bit_line = r_i if r_i is not None else arguments.get("r_i_bit_line")
+        resistances, applied_voltages = check.crossbar_requirements(
+            arguments.pop("resistances"),
+            arguments.pop("applied_voltages"),
+            r_i_word_line,
+            r_i_bit_line,
+        )
+        num_examples = applied_voltages.shape[1]
+        self.dtype = np.dtype(arguments.get("dtype", np.float64))
+
+        layout = [("resistances", resistances.shape), ("applied_voltages", applied_voltages.shape)]
+        self.inputs = _allocate(layout, self.dtype)
+        for name, array in (("resistances", resistances), ("applied_voltages", applied_voltages)):
+            _view(self.inputs, layout, name, self.dtype)[...] = array
+
+        self.output_layout = [("output", (num_examples, resistances.shape[1]))]
+        branch_shape = resistances.shape + (num_examples,)
+        if arguments["all_currents"]:
+            self.output_layout += [
+                (name, branch_shape) for name in ("device", "word_line", "bit_line")
+            ]
+        if arguments["node_voltages"]:
+            self.output_layout += [(name, branch_shape) for name in ("word_line_v", "bit_line_v")]
+        self.outputs = _allocate(self.output_layout, self.dtype)
+
+        self.descriptor = {
+            "inputs": (self.inputs.name, layout),
+            "outputs": (self.outputs.name, self.output_layout),
+            "dtype": self.dtype,
+            "arguments": arguments,
+        }
+
+    def solution(self, available: set[str]) -> computing.Solution:
+        """Copies the results out of shared memory.
+
+        Args:
+            available: Names of the fields that are not None, as well as
+                `"voltages"` if node voltages are not None.
+
+        Returns:
+            Branch currents and node voltages of the crossbar.
+        """
+        fields = {}
+        for name, _ in self.output_layout:
+            if name in available:
+                array = _view(self.outputs, self.output_layout, name, self.dtype).copy()
+                if name != "output":
+                    array = utils.squeeze_third_axis(array)
+                fields[name] = array
+        currents = computing.Currents(
+            *(fields.get(name) for name in ("output", "device", "word_line", "bit_line"))
+        )
+        if "voltages" in available:
+            voltages = computing.Voltages(fields.get("word_line_v"), fields.get("bit_line_v"))
+        else:
+            voltages = None
+        return computing.Solution(currents, voltages)
+
+    def release(self):
+        """Frees shared memory."""
+        for block in (self.inputs, self.outputs):
+            block.close()
+            block.unlink()
+
+
+def _run(descriptors: list[dict[str, Any]]) -> list[set[str]]:
+    """Runs simulations in a worker process.
+
+    Args:
+        descriptors: Locations of the inputs and outputs in shared memory and
+            the remaining arguments of `badcrossbar.compute()`.
+
+    Returns:
+        Names of the fields of each solution that are not None, as well as
+        `"voltages"` if node voltages are not None.
+    """
+    available = []
+    for descriptor in descriptors:
+        inputs = shared_memory.SharedMemory(name=descriptor["inputs"][0])
+        outputs = shared_memory.SharedMemory(name=descriptor["outputs"][0])
+        try:
+            input_layout, output_layout = descriptor["inputs"][1], descriptor["outputs"][1]
+            dtype = descriptor["dtype"]
+            solution = compute(
+                _view(inputs, input_layout, "applied_voltages", dtype),
+                _view(inputs, input_layout, "resistances", dtype),
+                **descriptor["arguments"],
+            )
+            fields = dict(zip(("output", "device", "word_line", "bit_line"), solution.currents))
+            if solution.voltages is not None:
+                fields["word_line_v"], fields["bit_line_v"] = solution.voltages
+            names = set() if solution.voltages is None else {"voltages"}
+            for name, shape in output_layout:
+                if fields.get(name) is not None:
+                    _view(outputs, output_layout, name, dtype)[...] = fields[name].reshape(shape)
+                    names.add(name)
+            available.append(names)
+        finally:
+            inputs.close()
+            outputs.close()
+    return available
+
+
+def _allocate(
+    layout: list[tuple[str, tuple[int, ...]]], dtype: np.dtype
+) -> shared_memory.SharedMemory:
+    """Allocates shared memory for float arrays.
+
+    Args:
+        layout: Names and shapes of the arrays.
+        dtype: Floating-point type of the arrays.
+
+    Returns:
+        Shared memory block.
+    """
+    size = sum(int(np.prod(shape)) for _, shape in layout) * dtype.itemsize
+    return shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+
+def _view(
+    block: shared_memory.SharedMemory,
+    layout: list[tuple[str, tuple[int, ...]]],
+    name: str,
+    dtype: np.dtype,
+) -> npt.NDArray:
+    """Returns array stored in shared memory.
+
+    Args:
+        block: Shared memory block.
+        layout: Names and shapes of the arrays stored in the block.
+        name: Name of the array.
+        dtype: Floating-point type of the arrays.
+
+    Returns:
+        Array backed by the shared memory.
+    """
+    offset = 0
+    for array_name, shape in layout:
+        if array_name == name:
+            return np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    raise KeyError(name)
+
+
+def _initialize_worker():
+    """Silences progress messages of the simulations in the worker processes."""
+    logging.getLogger("badcrossbar").setLevel(logging.WARNING)
@@ -1,6 +1,7 @@
 import logging
 import os
 import pickle
+import zipfile
 
 import numpy as np
 import numpy.typing as npt
@@ -51,7 +52,8 @@ def squeeze_third_axis(array: npt.NDArray) -> npt.NDArray:
     """
     if array.ndim == 3:
         if array.shape[2] == 1:
-            array = np.squeeze(array, axis=2)
+            # indexing, unlike `np.squeeze()`, preserves memory-mapped arrays.
+            array = array[:, :, 0]
 
     return array
 
@@ -133,6 +135,227 @@ def load_pickle(path: str, sanitize: bool = True):
     return variable
 
 
+def save_solution(
+    solution,
+    path: str,
+    compress: bool = False,
+    append: bool = False,
+    allow_overwrite: bool = False,
+    sanitize: bool = True,
+) -> str:
+    """Saves solution of a crossbar to a binary result store.
+
+    The store is a ZIP archive (readable with `np.load()`) with one `.npy`
+    member per field, e.g. `0/currents/device.npy`, where the leading number
+    is the index of the solution in the store. Arrays are stored with the
+    examples along the first axis, so that any range of examples can be
+    loaded without reading the rest, and they are written a block of
+    examples at a time, so memory-mapped results are never loaded entirely.
+    Groups of fields that are all None, e.g. the node voltages of a crossbar
+    with insulating interconnects, are stored as empty directory entries,
+    e.g. `0/voltages/`.
+
+    Args:
+        solution: Branch currents and node voltages returned by
+            `badcrossbar.compute()`.
+        path: Path to the store, excluding extension.
+        compress: If True, the arrays are compressed.
+        append: If True, the solution is added to the existing store (if
+            there is one) after the solutions already saved there.
+        allow_overwrite: If False and `append` is False, a number is appended
+            to the path if a file with the same name exists.
+        sanitize: If True, sanitizes the filename by removing illegal
+            characters and making the path compatible with the operating
+            system.
+
+    Returns:
+        Path to the store, including extension.
+    """
+    if sanitize:
+        path = sanitize_filepath(path, platform="auto")
+
+    if append or allow_overwrite:
+        path = f"{path}.npz"
+    else:
+        path = unique_path(path, "npz")
+
+    mode = "a" if append and os.path.exists(path) else "w"
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(path, mode, compression=compression, allowZip64=True) as archive:
+        index = _num_stored_solutions(archive)
+        for group_name, group in zip(solution._fields, solution):
+            if group is None:
+                continue
+            if all(array is None for array in group):
+                archive.writestr(f"{index}/{group_name}/", b"")
+                continue
+            for field, array in zip(group._fields, group):
+                if array is None:
+                    continue
+                member = f"{index}/{group_name}/{field}.npy"
+                with archive.open(member, "w", force_zip64=True) as handle:
+                    _write_examples(handle, np.asarray(array), examples_first=field == "output")
+
+    logger.info(f"Saved {path}.")
+    return path
+
+
+def load_solution(path: str, index: int = 0, examples: slice = None, sanitize: bool = True):
+    """Loads solution of a crossbar from a binary result store.
+
+    Nothing is read from the store until a field is accessed for the first
+    time, and then only that field (and only the requested examples) is
+    read.
+
+    Args:
+        path: Path to the store, including extension.
+        index: Index of the solution in the store. Negative indices count
+            from the end.
+        examples: Slice of the examples to be loaded. If None, all of them
+            are loaded.
+        sanitize: If True, sanitizes the filename by removing illegal
+            characters and making the path compatible with the operating
+            system.
+
+    Returns:
+        Branch currents and node voltages in the same format as returned by
+        `badcrossbar.compute()`. Fields that were None when saved are None.
+    """
+    # imported here because `badcrossbar.computing` depends on this module.
+    from badcrossbar.computing import extract
+
+    if sanitize:
+        path = sanitize_filepath(path, platform="auto")
+
+    with zipfile.ZipFile(path) as archive:
+        num_solutions = _num_stored_solutions(archive)
+        members = set(archive.namelist())
+    if not -num_solutions <= index < num_solutions:
+        raise IndexError(f"Store {path} contains {num_solutions} solution(s)!")
+    index %= num_solutions
+    if examples is None:
+        examples = slice(None)
+
+    def getter(member: str, examples_first: bool):
+        def read():
+            if member not in members:
+                return None
+            with zipfile.ZipFile(path) as archive, archive.open(member) as handle:
+                return _read_examples(handle, examples, examples_first)
+
+        return read
+
+    groups = {}
+    for group_name, group_type in (("currents", extract.Currents), ("voltages", extract.Voltages)):
+        prefix = f"{index}/{group_name}/"
+        if not any(member.startswith(prefix) for member in members):
+            groups[group_name] = None
+            continue
+        groups[group_name] = extract.LazyRecord(
+            group_type,
+            **{
+                field: getter(f"{prefix}{field}.npy", field == "output")
+                for field in group_type._fields
+            },
+        )
+
+    return extract.Solution(**groups)
+
+
+def num_stored_solutions(path: str, sanitize: bool = True) -> int:
+    """Counts solutions in a binary result store.
+
+    Args:
+        path: Path to the store, including extension.
+        sanitize: If True, sanitizes the filename by removing illegal
+            characters and making the path compatible with the operating
+            system.
+
+    Returns:
+        Number of solutions.
+    """
+    if sanitize:
+        path = sanitize_filepath(path, platform="auto")
+
+    with zipfile.ZipFile(path) as archive:
+        return _num_stored_solutions(archive)
+
+
+def _num_stored_solutions(archive: zipfile.ZipFile) -> int:
+    """Counts solutions in an open result store.
+
+    Args:
+        archive: Result store.
+
+    Returns:
+        Number of solutions.
+    """
+    indices = {int(name.split("/", 1)[0]) for name in archive.namelist()}
+    return max(indices, default=-1) + 1
+
+
+def _write_examples(handle, array: npt.NDArray, examples_first: bool, block_bytes: int = 2**26):
+    """Writes array to a `.npy` file with the examples along the first axis.
+
+    Args:
+        handle: File opened for writing.
+        array: Output currents of shape `p x n`, or branch or node values of
+            shape `m x n` or `m x n x p`.
+        examples_first: If True, the examples are already along the first
+            axis.
+        block_bytes: Approximate size of the blocks of examples written at a
+            time.
+    """
+    if not examples_first:
+        array = np.moveaxis(array.reshape(array.shape[:2] + (-1,)), -1, 0)
+    header = {
+        "descr": np.lib.format.dtype_to_descr(array.dtype),
+        "fortran_order": False,
+        "shape": array.shape,
+    }
+    np.lib.format.write_array_header_1_0(handle, header)
+
+    example_bytes = max(array[:1].nbytes, 1)
+    block_size = max(1, block_bytes // example_bytes)
+    for start in range(0, array.shape[0], block_size):
+        handle.write(np.ascontiguousarray(array[start : start + block_size]).tobytes())
+
+
+def _read_examples(handle, examples: slice, examples_first: bool) -> npt.NDArray:
+    """Reads some of the examples from a `.npy` file written by
+    `_write_examples()`.
+
+    Args:
+        handle: File opened for reading.
+        examples: Slice of the examples.
+        examples_first: If True, the array is returned with the examples
+            along the first axis. Otherwise, they are moved to the third axis,
+            which is removed if only one example is read.
+
+    Returns:
+        Array of the examples.
+    """
+    version = np.lib.format.read_magic(handle)
+    if version == (1, 0):
+        shape, _, dtype = np.lib.format.read_array_header_1_0(handle)
+    else:
+        shape, _, dtype = np.lib.format.read_array_header_2_0(handle)
+
+    # only the range of examples spanned by the slice is read.
+    selected = range(*examples.indices(shape[0]))
+    first, last = (min(selected), max(selected)) if selected else (0, -1)
+    array = np.empty((last + 1 - first,) + tuple(shape[1:]), dtype=dtype)
+    handle.seek(first * array[:1].nbytes, os.SEEK_CUR)
+    if handle.readinto(array.reshape(-1).view(np.uint8)) != array.nbytes:
+        raise ValueError("Result store is truncated!")
+    if selected.step != 1:
+        array = array[np.asarray(selected, dtype=int) - first]
+
+    if examples_first:
+        return array
+    return squeeze_third_axis(np.moveaxis(array, 0, -1))
+
+
 def distributed_array(flattened_array: npt.NDArray, model_array: npt.NDArray) -> npt.NDArray:
     """Reshapes flattened array.
 
@@ -0,0 +1,64 @@
+"""Compares extraction of interconnect currents on lines with zero
+resistance using cumulative sums with the previous implementation that added
+repeated slices of device currents in a loop.
+
+Requires badcrossbar to be installed, e.g. with `pip install -e .`:
+
+    python benchmarks/zero_resistance_extraction.py
+"""
+
+import timeit
+
+import numpy as np
+
+from badcrossbar.computing import extract
+
+# Number of word lines and examples.
+num_word_lines = 16
+num_examples = 64
+
+# Widths of the crossbars, i.e. numbers of bit lines.
+widths = [128, 256, 512, 1024]
+
+
+def loop_word_line_currents(device_i):
+    """Previous implementation of `extract.word_line_currents()`."""
+    word_line_i = np.repeat(device_i[:, -1:], device_i.shape[1], axis=1)
+    for i in range(1, device_i.shape[1]):
+        word_line_i[:, :-i] += np.repeat(device_i[:, -(1 + i) : -i], device_i.shape[1] - i, axis=1)
+    return word_line_i
+
+
+def loop_bit_line_currents(device_i):
+    """Previous implementation of `extract.bit_line_currents()`."""
+    bit_line_i = np.zeros(device_i.shape)
+    for i in range(device_i.shape[0]):
+        bit_line_i[i:] += np.repeat(device_i[i : i + 1], device_i.shape[0] - i, axis=0)
+    return bit_line_i
+
+
+r_i = extract.Interconnect(0, 0)
+rng = np.random.default_rng(0)
+print(f"{'width':>6} {'line':>5} {'loop (s)':>10} {'cumsum (s)':>11} {'speedup':>8}")
+for width in widths:
+    shape = (num_word_lines, width, num_examples)
+    device_i = rng.uniform(0, 1e-3, shape)
+    applied_voltages = np.ones((num_word_lines, num_examples))
+    voltages = extract.Voltages(None, None)
+
+    for line, loop, vectorized in [
+        ("word", loop_word_line_currents, extract.word_line_currents),
+        ("bit", loop_bit_line_currents, extract.bit_line_currents),
+    ]:
+        if line == "word":
+            args = (voltages, device_i, r_i, applied_voltages)
+        else:
+            args = (voltages, device_i, r_i)
+        np.testing.assert_allclose(vectorized(*args), loop(device_i))
+
+        loop_time = min(timeit.repeat(lambda: loop(device_i), number=1, repeat=3))
+        vectorized_time = min(timeit.repeat(lambda: vectorized(*args), number=1, repeat=3))
+        print(
+            f"{width:>6} {line:>5} {loop_time:>10.4f} {vectorized_time:>11.4f} "
+            f"{loop_time / vectorized_time:>7.0f}x"
+        )
@@ -77,8 +77,8 @@ non_infinite_array_error = [False, True, False, True, True, False]
 non_infinite_array_arguments = zip(non_infinite_array_array, non_infinite_array_error)
 
 # number()
-number_value = [1, 0.5, -3, 0, np.inf, None, "a", np.array([1, 2, 3])]
-number_error = [False, False, False, False, False, True, True, True]
+number_value = [1, 0.5, -3, 0, np.inf, np.float32(0.5), None, "a", np.array([1, 2, 3])]
+number_error = [False, False, False, False, False, False, True, True, True]
 number_arguments = zip(number_value, number_error)
 
 # non_negative_number()
@@ -285,3 +285,71 @@ def test_short_circuit(resistances, r_i, error):
             check.short_circuit(resistances, *r_i)
     else:
         check.short_circuit(resistances, *r_i)
+
+
+interconnect_r_i = [
+    (0.5, 0),
+    (np.ones((2, 3)), 0),
+    (np.ones((2, 3)), np.ones((2, 3))),
+    (np.ones((3, 2)), 0),
+    (np.zeros((2, 3)), 0),
+    (np.full((2, 3), np.inf), 0),
+    (0.5, -np.ones((2, 3))),
+]
+interconnect_error = [None, None, None, ValueError, ValueError, ValueError, ValueError]
+interconnect_arguments = list(zip(interconnect_r_i, interconnect_error))
+
+
+@pytest.mark.parametrize("r_i,error", interconnect_arguments)
+def test_interconnect_requirements(r_i, error):
+    """Tests `badcrossbar.check.interconnect_requirements()`.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float or ndarray)
+        Interconnect resistances along the word and bit line segments.
+    error : Exception or None
+        Error that should be raised.
+    """
+    if error is not None:
+        with pytest.raises(error):
+            check.interconnect_requirements(*r_i, (2, 3))
+    else:
+        check.interconnect_requirements(*r_i, (2, 3))
+
+
+crossbar_inputs = [
+    (np.ones((2, 3)), np.ones((2, 1)), 0.5),
+    (np.array([[1, 0, 1], [1, 1, 1]]), np.ones((2, 1)), 0.5),
+    (np.array([[1, -1, 1], [1, 1, 1]]), np.ones((2, 1)), 0.5),
+    (np.ones((2, 3)), np.ones((3, 1)), 0.5),
+    (np.ones((2, 3)), np.ones((2, 1)), -0.5),
+]
+crossbar_error = [None, ValueError, ValueError, ValueError, ValueError]
+crossbar_arguments = list(zip(crossbar_inputs, crossbar_error))
+
+
+@pytest.mark.parametrize("inputs,error", crossbar_arguments)
+def test_crossbar_requirements(inputs, error):
+    """Tests `badcrossbar.check.crossbar_requirements()`.
+
+    Parameters
+    ----------
+    inputs : tuple of (ndarray, ndarray, int or float)
+        Resistances, applied voltages and interconnect resistance.
+    error : Exception or None
+        Error that should be raised.
+    """
+    resistances, applied_voltages, r_i = inputs
+    if error is not None:
+        with pytest.raises(error):
+            check.crossbar_requirements(resistances, applied_voltages, r_i, r_i)
+    else:
+        results = check.crossbar_requirements(resistances, applied_voltages, r_i, r_i)
+        assert results[0] is resistances
+        assert results[1] is applied_voltages
+
+    # trusted inputs are neither checked nor copied.
+    results = check.crossbar_requirements(resistances, applied_voltages, r_i, r_i, validate=False)
+    assert results[0] is resistances
+    assert results[1] is applied_voltages
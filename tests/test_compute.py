@@ -1,3 +1,5 @@
+import logging
+import pickle
 from collections import namedtuple
 from pathlib import Path
 
@@ -265,3 +267,710 @@ def compare_voltages(computed_voltages, expected_voltages):
     """
     np.testing.assert_array_almost_equal(computed_voltages.word_line, expected_voltages.word_line)
     np.testing.assert_array_almost_equal(computed_voltages.bit_line, expected_voltages.bit_line)
+
+
+def compare_solutions(computed_solution, expected_solution, rtol=1e-7, atol=1e-12):
+    """Compares solutions field by field, including the ones that are None.
+
+    Parameters
+    ----------
+    computed_solution : named tuple
+        Computed branch currents and node voltages.
+    expected_solution : named tuple
+        Expected branch currents and node voltages.
+    rtol : float, optional
+        Relative tolerance.
+    atol : float, optional
+        Absolute tolerance as a fraction of the largest magnitude of each
+        expected field, so that currents and voltages can be compared with
+        the same tolerance.
+    """
+    for computed, expected in zip(computed_solution, expected_solution):
+        if expected is None:
+            assert computed is None
+            continue
+        for computed_field, expected_field in zip(computed, expected):
+            if expected_field is None:
+                assert computed_field is None
+            else:
+                scale = np.abs(expected_field).max(initial=0)
+                np.testing.assert_allclose(
+                    computed_field, expected_field, rtol=rtol, atol=atol * scale
+                )
+
+
+@pytest.mark.parametrize("filenames", multiple_input_names)
+def test_crossbar_qucs_multiple_inputs(filenames):
+    """Tests currents and voltages computed by `badcrossbar.Crossbar` with
+    the ones computed in Qucs circuit simulation software when applying
+    multiple inputs.
+
+    Parameters
+    ----------
+    filenames : str
+        Names of the Qucs files used.
+    """
+    (
+        resistances,
+        applied_voltages,
+        r_i_word_line,
+        r_i_bit_line,
+        expected_solution,
+    ) = qucs_data_multiple(filenames)
+    crossbar = badcrossbar.Crossbar(resistances, None, r_i_word_line, r_i_bit_line)
+    # the same factorization is reused for every call.
+    for _ in range(2):
+        computed_solution = crossbar.apply(applied_voltages)
+        compare_currents(computed_solution.currents, expected_solution.currents)
+        compare_voltages(computed_solution.voltages, expected_solution.voltages)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0), (np.inf, np.inf)])
+@pytest.mark.parametrize("num_examples", [1, 3])
+def test_compute_batch(r_i, num_examples):
+    """Tests that `badcrossbar.compute_batch()` agrees with
+    `badcrossbar.compute()` applied to each crossbar separately.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    num_examples : int
+        Number of sets of applied voltages.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 5, 3))
+    applied_voltages = rng.uniform(-1, 1, (4, 5, num_examples))
+
+    batch_solution = badcrossbar.compute_batch(applied_voltages, resistances, None, *r_i)
+    for idx in range(resistances.shape[0]):
+        expected_solution = badcrossbar.compute(applied_voltages[idx], resistances[idx], None, *r_i)
+        computed_solution = Solution(
+            *(
+                [None if field is None else field[idx] for field in fields]
+                for fields in batch_solution
+            )
+        )
+        compare_solutions(computed_solution, expected_solution)
+
+
+@pytest.mark.parametrize("option", [{"solver": "bogus"}, {"tol": 1e-3}, {"block_size": 2}])
+def test_compute_batch_options(option):
+    """Tests that `badcrossbar.compute_batch()` rejects options it does not
+    support.
+
+    Parameters
+    ----------
+    option : dict of any
+        Keyword argument of `badcrossbar.compute()`.
+    """
+    resistances = np.ones((2, 3, 4))
+    applied_voltages = np.ones((3, 1))
+    with pytest.raises(TypeError):
+        badcrossbar.compute_batch(applied_voltages, resistances, 0.5, **option)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0)])
+def test_compute_stream(r_i):
+    """Tests that `badcrossbar.compute_stream()` agrees with
+    `badcrossbar.compute()` applied to each chunk of voltages.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (5, 3))
+    chunks = [rng.uniform(-1, 1, (5, num_examples)) for num_examples in [1, 4, 2]]
+
+    solutions = badcrossbar.compute_stream(
+        iter(chunks), resistances, None, *r_i, node_voltages=False, all_currents=False
+    )
+    solutions = list(solutions)
+    assert len(solutions) == len(chunks)
+    for chunk, solution in zip(chunks, solutions):
+        expected_solution = badcrossbar.compute(chunk, resistances, None, *r_i)
+        np.testing.assert_array_almost_equal(
+            solution.currents.output, expected_solution.currents.output
+        )
+        assert solution.currents.device is None
+        assert solution.voltages is None
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0)])
+@pytest.mark.parametrize("num_examples", [1, 3])
+def test_output_currents_only(r_i, num_examples):
+    """Tests that output currents computed without extracting node voltages
+    and the remaining currents agree with the full solution.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    num_examples : int
+        Number of sets of applied voltages.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (5, 3))
+    resistances[1, 2] = np.inf
+    applied_voltages = rng.uniform(-1, 1, (5, num_examples))
+
+    expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i)
+    computed_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, *r_i, node_voltages=False, all_currents=False
+    )
+    np.testing.assert_array_almost_equal(
+        computed_solution.currents.output, expected_solution.currents.output
+    )
+    assert computed_solution.currents.device is None
+    assert computed_solution.voltages is None
+
+
+@pytest.mark.parametrize(
+    "r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0), (np.inf, np.inf), (0, np.inf)]
+)
+@pytest.mark.parametrize("shape", [(5, 3), (3, 5), (4, 4)])
+def test_effective_conductances(r_i, shape):
+    """Tests that output currents computed using effective conductances of
+    `badcrossbar.Crossbar` agree with `badcrossbar.compute()`.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    shape : tuple of int
+        Shape of the crossbar.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, shape)
+    applied_voltages = rng.uniform(-1, 1, (shape[0], 3))
+
+    crossbar = badcrossbar.Crossbar(resistances, None, *r_i)
+    assert crossbar.effective_conductances.shape == shape
+    expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i)
+    np.testing.assert_allclose(
+        crossbar.output_currents(applied_voltages),
+        expected_solution.currents.output,
+        rtol=1e-8,
+        atol=1e-15,
+    )
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0), (np.inf, np.inf)])
+def test_crossbar_vjp(r_i):
+    """Tests gradients returned by `badcrossbar.Crossbar.vjp()` against finite
+    differences.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 3))
+    applied_voltages = rng.uniform(-1, 1, (4, 2))
+    output_gradients = rng.uniform(-1, 1, (2, 3))
+
+    def loss(resistances, applied_voltages):
+        solution = badcrossbar.compute(
+            applied_voltages, resistances, None, *r_i, node_voltages=False, all_currents=False
+        )
+        return np.sum(solution.currents.output * output_gradients)
+
+    crossbar = badcrossbar.Crossbar(resistances, None, *r_i)
+    output_currents, vjp = crossbar.vjp(applied_voltages)
+    np.testing.assert_allclose(
+        np.sum(output_currents * output_gradients), loss(resistances, applied_voltages)
+    )
+    resistance_gradients, voltage_gradients = vjp(output_gradients)
+
+    for array, gradients in [
+        (resistances, resistance_gradients),
+        (applied_voltages, voltage_gradients),
+    ]:
+        expected_gradients = np.zeros(array.shape)
+        for idx in np.ndindex(array.shape):
+            step = 1e-6 * max(abs(array[idx]), 1)
+            perturbed = [array.copy(), array.copy()]
+            perturbed[0][idx] += step
+            perturbed[1][idx] -= step
+            if array is resistances:
+                losses = [loss(p, applied_voltages) for p in perturbed]
+            else:
+                losses = [loss(resistances, p) for p in perturbed]
+            expected_gradients[idx] = (losses[0] - losses[1]) / (2 * step)
+        np.testing.assert_allclose(gradients, expected_gradients, rtol=1e-5, atol=1e-12)
+
+    # single-precision crossbars back-propagate single-precision gradients.
+    crossbar = badcrossbar.Crossbar(resistances, None, *r_i, dtype=np.float32)
+    single_output_currents, vjp = crossbar.vjp(applied_voltages)
+    assert single_output_currents.dtype == np.float32
+    np.testing.assert_allclose(single_output_currents, output_currents, rtol=1e-4)
+    for single_gradients, gradients in zip(
+        vjp(output_gradients), (resistance_gradients, voltage_gradients)
+    ):
+        assert single_gradients.dtype == np.float32
+        np.testing.assert_allclose(single_gradients, gradients, rtol=1e-3, atol=1e-9)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0)])
+@pytest.mark.parametrize("solver", ["direct", "cg"])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_crossbar_update(r_i, solver, dtype):
+    """Tests that `badcrossbar.Crossbar.update()` gives the same solution as
+    a crossbar created with the new resistances.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    solver : str
+        Method used to solve the system of nodal equations.
+    dtype : type
+        Floating-point type of the computations.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (5, 4)).astype(dtype)
+    applied_voltages = rng.uniform(-1, 1, (5, 3))
+    crossbar = badcrossbar.Crossbar(resistances, None, *r_i, solver=solver, tol=1e-12, dtype=dtype)
+    tolerance = 1e-7 if dtype == np.float64 else 1e-3
+
+    # low-rank updates accumulate until there are too many changed devices.
+    for indices, new_resistances in [
+        (([0, 3], [1, 2]), [200, np.inf]),
+        ((4, 3), 150),
+        ((0, 1), resistances[0, 1]),
+        ((slice(None), 0), rng.uniform(100, 1000, 5)),
+    ]:
+        crossbar.update(indices, new_resistances, max_rank=4)
+        resistances = resistances.copy()
+        resistances[indices] = new_resistances
+        np.testing.assert_array_equal(crossbar.resistances, resistances)
+
+        expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i)
+        computed_solution = crossbar.apply(applied_voltages)
+        assert computed_solution.currents.device.dtype == dtype
+        compare_solutions(computed_solution, expected_solution, rtol=tolerance, atol=tolerance)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0)])
+def test_compute_nonlinear(r_i, caplog):
+    """Tests `badcrossbar.compute()` with nonlinear devices.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    caplog : LogCaptureFixture
+        Captured log messages.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (5, 4))
+    applied_voltages = rng.uniform(-1, 1, (5, 3))
+
+    # ohmic devices give the same solution as the linear solver.
+    expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i)
+    computed_solution = badcrossbar.compute(
+        applied_voltages,
+        resistances,
+        None,
+        *r_i,
+        device_current=lambda v, r: v / r,
+        device_conductance=lambda v, r: 1 / r,
+    )
+    compare_solutions(computed_solution, expected_solution)
+
+    # with strongly nonlinear devices, currents are still conserved.
+    v_0 = 0.1
+    solution = badcrossbar.compute(
+        applied_voltages,
+        resistances,
+        None,
+        *r_i,
+        device_current=lambda v, r: v_0 / r * np.sinh(v / v_0),
+        device_conductance=lambda v, r: np.cosh(v / v_0) / r,
+        newton_tol=1e-12,
+    )
+    device_i = solution.currents.device
+    np.testing.assert_allclose(
+        solution.currents.output, np.sum(device_i, axis=0).T, rtol=1e-6, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        solution.currents.word_line[:, 0], np.sum(device_i, axis=1), rtol=1e-6, atol=1e-12
+    )
+    assert not np.allclose(solution.currents.output, expected_solution.currents.output)
+
+    # iteration statistics are reported for each example.
+    info = solution.info
+    assert info.iterations.shape == info.updates.shape == (3,)
+    if r_i == (0, 0):
+        np.testing.assert_array_equal(info.iterations, 0)
+    else:
+        assert np.all(info.iterations > 1)
+        assert np.all(info.updates <= 1e-12)
+
+        # statistics of lazy and chunked solutions match.
+        for kwargs in [{"lazy": True}, {"memory_limit": 1}]:
+            other_solution = badcrossbar.compute(
+                applied_voltages,
+                resistances,
+                None,
+                *r_i,
+                device_current=lambda v, r: v_0 / r * np.sinh(v / v_0),
+                device_conductance=lambda v, r: np.cosh(v / v_0) / r,
+                newton_tol=1e-12,
+                **kwargs,
+            )
+            np.testing.assert_array_equal(other_solution.info.iterations, info.iterations)
+
+        # too few iterations are reported as non-convergence.
+        with caplog.at_level(logging.WARNING, logger="badcrossbar.computing.newton"):
+            unconverged_solution = badcrossbar.compute(
+                applied_voltages,
+                resistances,
+                None,
+                *r_i,
+                device_current=lambda v, r: v_0 / r * np.sinh(v / v_0),
+                device_conductance=lambda v, r: np.cosh(v / v_0) / r,
+                newton_tol=1e-12,
+                newton_maxiter=1,
+            )
+        np.testing.assert_array_equal(unconverged_solution.info.iterations, 1)
+        assert np.all(unconverged_solution.info.updates > 1e-12)
+        assert "did not converge" in caplog.text
+
+    # ohmic devices report no statistics.
+    assert expected_solution.info is None
+
+    # single-precision solutions converge to the rounding error of float32.
+    single_solution = badcrossbar.compute(
+        applied_voltages,
+        resistances,
+        None,
+        *r_i,
+        device_current=lambda v, r: v_0 / r * np.sinh(v / v_0),
+        device_conductance=lambda v, r: np.cosh(v / v_0) / r,
+        dtype=np.float32,
+    )
+    assert np.all(single_solution.info.iterations < 50)
+    compare_solutions(single_solution, solution, rtol=1e-3, atol=1e-3)
+    for field in single_solution.currents + single_solution.voltages:
+        assert field.dtype == np.float32
+
+
+def nodal_analysis_voltages(applied_voltages, resistances, r_i_word_line, r_i_bit_line):
+    """Computes node voltages by applying nodal analysis to the whole circuit.
+
+    Parameters
+    ----------
+    applied_voltages : ndarray
+        Applied voltages.
+    resistances : ndarray
+        Resistances of crossbar devices.
+    r_i_word_line : ndarray
+        Resistances of the word line segments.
+    r_i_bit_line : ndarray
+        Resistances of the bit line segments.
+
+    Returns
+    -------
+    tuple of ndarray
+        Voltages at the nodes on the word and bit lines.
+    """
+    m, n = resistances.shape
+    size = m * n
+    # nodes on the word lines, nodes on the bit lines, sources and the ground.
+    laplacian = np.zeros((2 * size + m + 1, 2 * size + m + 1))
+
+    def connect(a, b, r):
+        laplacian[[a, b], [a, b]] += 1 / r
+        laplacian[a, b] -= 1 / r
+        laplacian[b, a] -= 1 / r
+
+    for i in range(m):
+        for j in range(n):
+            connect(i * n + j, size + i * n + j, resistances[i, j])
+            connect(i * n + j, i * n + j - 1 if j > 0 else 2 * size + i, r_i_word_line[i, j])
+            connect(
+                size + i * n + j, size + (i + 1) * n + j if i < m - 1 else -1, r_i_bit_line[i, j]
+            )
+
+    known = np.zeros((m + 1, applied_voltages.shape[1]))
+    known[:m] = applied_voltages
+    unknown_v = np.linalg.solve(
+        laplacian[: 2 * size, : 2 * size], -laplacian[: 2 * size, 2 * size :] @ known
+    )
+    return unknown_v[:size].reshape(m, n, -1), unknown_v[size:].reshape(m, n, -1)
+
+
+@pytest.mark.parametrize("solver", ["direct", "cg", "schur"])
+def test_compute_segment_resistances(solver):
+    """Tests `badcrossbar.compute()` with a different resistance for each
+    interconnect segment against nodal analysis of the whole circuit.
+
+    Parameters
+    ----------
+    solver : str
+        Method used to solve the system of nodal equations.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 3))
+    applied_voltages = rng.uniform(-1, 1, (4, 2))
+    r_i_word_line = rng.uniform(0.5, 5, (4, 3))
+    r_i_bit_line = rng.uniform(0.5, 5, (4, 3))
+
+    solution = badcrossbar.compute(
+        applied_voltages, resistances, None, r_i_word_line, r_i_bit_line, solver=solver, tol=1e-12
+    )
+    expected_word_line_v, expected_bit_line_v = nodal_analysis_voltages(
+        applied_voltages, resistances, r_i_word_line, r_i_bit_line
+    )
+    np.testing.assert_allclose(solution.voltages.word_line, expected_word_line_v, rtol=1e-8)
+    np.testing.assert_allclose(solution.voltages.bit_line, expected_bit_line_v, atol=1e-10)
+    np.testing.assert_allclose(
+        solution.currents.output, expected_bit_line_v[-1].T / r_i_bit_line[-1], rtol=1e-8
+    )
+    np.testing.assert_allclose(
+        solution.currents.bit_line[-1], solution.currents.output.T, rtol=1e-8
+    )
+    np.testing.assert_allclose(
+        solution.currents.word_line[:, 0],
+        (applied_voltages - expected_word_line_v[:, 0]) / r_i_word_line[:, [0]],
+        rtol=1e-8,
+    )
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25)])
+def test_compute_line_ends(r_i):
+    """Tests that source and sink resistances are equivalent to increasing
+    the resistance of the segments at the ends of the lines.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 3))
+    applied_voltages = rng.uniform(-1, 1, (4, 2))
+    r_i_word_line, r_i_bit_line = (np.full(resistances.shape, float(r)) for r in r_i)
+    kwargs = {}
+    if r_i[0] > 0:
+        kwargs["r_source"] = np.arange(1, 5)
+        r_i_word_line[:, 0] += np.arange(1, 5)
+    if r_i[1] > 0:
+        kwargs["r_sink"] = 2
+        r_i_bit_line[-1] += 2
+    r_i_word_line, r_i_bit_line = (r if r.any() else 0 for r in (r_i_word_line, r_i_bit_line))
+
+    computed_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i, **kwargs)
+    expected_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, r_i_word_line, r_i_bit_line
+    )
+    compare_solutions(computed_solution, expected_solution, rtol=1e-10, atol=0)
+
+    with pytest.raises(ValueError):
+        badcrossbar.compute(applied_voltages, resistances, None, 0, 0, r_source=1)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0), (np.inf, np.inf)])
+@pytest.mark.parametrize("solver", ["direct", "cg", "schur"])
+def test_compute_dtype(r_i, solver):
+    """Tests that single-precision computations return single-precision
+    arrays that agree with double-precision results.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    solver : str
+        Method used to solve the system of nodal equations.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(1000, 10000, (6, 5))
+    applied_voltages = rng.uniform(-1, 1, (6, 3))
+
+    expected_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, *r_i, solver=solver
+    )
+    computed_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, *r_i, solver=solver, dtype=np.float32
+    )
+    # currents along the word lines are computed from differences of nearly
+    # equal potentials, so the tolerance is relative to the largest value.
+    compare_solutions(computed_solution, expected_solution, rtol=1e-3, atol=1e-3)
+    for field in computed_solution.currents + computed_solution.voltages:
+        assert field is None or field.dtype == np.float32
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0), (np.inf, np.inf)])
+def test_dtype_entry_points(r_i):
+    """Tests that the other entry points return arrays of the requested
+    type.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(1000, 10000, (6, 5))
+    applied_voltages = rng.uniform(-1, 1, (6, 3))
+
+    expected_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, *r_i, dtype=np.float32
+    )
+    crossbar = badcrossbar.Crossbar(resistances, None, *r_i, dtype=np.float32)
+    (stream_solution,) = badcrossbar.compute_stream(
+        [applied_voltages], resistances, None, *r_i, dtype=np.float32
+    )
+    batch_solution = badcrossbar.compute_batch(
+        applied_voltages, resistances[np.newaxis], None, *r_i, dtype=np.float32
+    )
+    batch_solution = Solution(
+        *([None if field is None else field[0] for field in fields] for fields in batch_solution)
+    )
+    for computed_solution in [crossbar.apply(applied_voltages), stream_solution, batch_solution]:
+        compare_solutions(computed_solution, expected_solution, rtol=1e-3, atol=1e-3)
+        for field in computed_solution.currents + computed_solution.voltages:
+            assert field is None or field.dtype == np.float32
+
+    output_i = crossbar.output_currents(applied_voltages)
+    assert output_i.dtype == np.float32
+    np.testing.assert_allclose(output_i, expected_solution.currents.output, rtol=1e-3)
+
+    with pytest.raises(TypeError):
+        crossbar.apply(applied_voltages, dtype=np.float32)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0)])
+@pytest.mark.parametrize("num_examples", [1, 3])
+def test_extract_out(r_i, num_examples):
+    """Tests that currents are written to the buffers supplied by the caller.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    num_examples : int
+        Number of sets of applied voltages.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 5))
+    applied_voltages = rng.uniform(-1, 1, (4, num_examples))
+    kwargs = {"node_voltages": True, "all_currents": True}
+
+    expected_solution = badcrossbar.computing.extract.solution(
+        resistances, *r_i, applied_voltages, **kwargs
+    )
+    shape = utils.squeeze_third_axis(np.empty((4, 5, num_examples))).shape
+    out = badcrossbar.computing.Currents(None, *(np.empty(shape) for _ in range(3)))
+    computed_solution = badcrossbar.computing.extract.solution(
+        resistances, *r_i, applied_voltages, out=out, **kwargs
+    )
+    for field in ["device", "word_line", "bit_line"]:
+        assert getattr(computed_solution.currents, field) is getattr(out, field)
+    compare_currents(computed_solution.currents, expected_solution.currents)
+
+    # buffers of the wrong type are rejected.
+    out = badcrossbar.computing.Currents(None, np.empty(shape, dtype=np.float32), None, None)
+    with pytest.raises(ValueError):
+        badcrossbar.compute(applied_voltages, resistances, None, *r_i, out=out)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0), (np.inf, np.inf)])
+@pytest.mark.parametrize("num_examples", [1, 3])
+def test_compute_lazy(r_i, num_examples):
+    """Tests that lazily extracted solution agrees with the one extracted
+    eagerly and is converted to named tuples when pickled.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    num_examples : int
+        Number of sets of applied voltages.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 5))
+    applied_voltages = rng.uniform(-1, 1, (4, num_examples))
+
+    expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i)
+    computed_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i, lazy=True)
+
+    output = computed_solution.currents.output
+    np.testing.assert_array_almost_equal(output, expected_solution.currents.output)
+    assert computed_solution.currents[0] is output
+    compare_currents(computed_solution.currents, expected_solution.currents)
+    if expected_solution.voltages.word_line is not None:
+        compare_voltages(computed_solution.voltages, expected_solution.voltages)
+
+    pickled_solution = pickle.loads(pickle.dumps(computed_solution))
+    assert type(pickled_solution.currents) is badcrossbar.computing.Currents
+    compare_currents(pickled_solution.currents, expected_solution.currents)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0.5, 0), (0, 0.25), (0, 0), (np.inf, np.inf)])
+@pytest.mark.parametrize("examples_per_chunk", [1, 2])
+@pytest.mark.parametrize("all_outputs", [True, False])
+def test_compute_memory_limit(r_i, examples_per_chunk, all_outputs):
+    """Tests that solving for the examples in chunks gives the same results
+    as solving for all of them at once.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    examples_per_chunk : int
+        Number of examples whose intermediate arrays fit into memory limit.
+    all_outputs : bool
+        Whether all currents and node voltages are returned.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 5))
+    applied_voltages = rng.uniform(-1, 1, (4, 5))
+    kwargs = {"all_currents": all_outputs, "node_voltages": all_outputs}
+    memory_limit = examples_per_chunk * badcrossbar.computing.extract.WORKING_ARRAYS * 2 * 20 * 8
+
+    expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i, **kwargs)
+    computed_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, *r_i, memory_limit=memory_limit, **kwargs
+    )
+    compare_solutions(computed_solution, expected_solution)
+
+
+@pytest.mark.parametrize("r_i", [(0.5, 0.25), (0, 0.25), (0, 0), (np.inf, np.inf)])
+@pytest.mark.parametrize("num_examples", [1, 5])
+def test_compute_output_dir(r_i, num_examples, tmp_path):
+    """Tests that results written to memory-mapped files agree with the ones
+    computed in memory.
+
+    Parameters
+    ----------
+    r_i : tuple of (int or float)
+        Interconnect resistances along the word and bit line segments.
+    num_examples : int
+        Number of sets of applied voltages.
+    tmp_path : pathlib.Path
+        Temporary directory.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (4, 5))
+    applied_voltages = rng.uniform(-1, 1, (4, num_examples))
+
+    expected_solution = badcrossbar.compute(applied_voltages, resistances, None, *r_i)
+    # missing directories are created.
+    output_dir = tmp_path / "results" / "run"
+    computed_solution = badcrossbar.compute(
+        applied_voltages, resistances, None, *r_i, memory_limit=1, output_dir=str(output_dir)
+    )
+    assert isinstance(computed_solution.currents.device, np.memmap)
+    compare_currents(computed_solution.currents, expected_solution.currents)
+    if expected_solution.voltages.word_line is not None:
+        compare_voltages(computed_solution.voltages, expected_solution.voltages)
+
+    device_i = np.load(output_dir / "device_currents.npy", mmap_mode="r")
+    np.testing.assert_array_almost_equal(
+        utils.squeeze_third_axis(device_i), expected_solution.currents.device
+    )
@@ -54,3 +54,42 @@ def test_i(applied_voltages, resistances, r_i, expected):
     """Tests `badcrossbar.computing.fill.i()`."""
     i_matrix = computing.fill.i(applied_voltages, resistances, r_i)
     np.testing.assert_array_almost_equal(i_matrix, expected)
+
+
+# g
+g_resistances_list = [
+    np.array([[10]]),
+    np.array([[10, 20, 30]]),
+    np.array([[10], [20], [30]]),
+    np.array([[10, 20, 30], [40, 50, 60]]),
+    np.array([[10, np.inf], [30, 40], [50, 60]]),
+]
+g_r_i_list = [Interconnect(0.5, 0.25), Interconnect(0.5, 0), Interconnect(0, 0.25)]
+g_inputs = [(resistances, r_i) for resistances in g_resistances_list for r_i in g_r_i_list]
+
+
+@pytest.mark.parametrize("resistances,r_i", g_inputs)
+def test_g_methods(resistances, r_i):
+    """Tests that `badcrossbar.computing.fill.g()` produces the same matrix
+    regardless of the assembly method."""
+    coo_g = computing.fill.g(resistances, r_i, method="coo")
+    lil_g = computing.fill.g(resistances, r_i, method="lil")
+    np.testing.assert_array_almost_equal(coo_g.toarray(), lil_g.toarray())
+
+
+def test_g_pattern_cache():
+    """Tests that `badcrossbar.computing.fill.g()` reuses cached sparsity
+    patterns."""
+    computing.pattern.cache_clear()
+    resistances = np.array([[10, 20, 30], [40, 50, 60]])
+    r_i = Interconnect(0.5, 0.25)
+    computing.fill.g(resistances, r_i)
+    cached_g = computing.fill.g(2 * resistances, r_i)
+    info = computing.pattern.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    expected_g = computing.fill.g(2 * resistances, r_i, method="lil")
+    np.testing.assert_array_almost_equal(cached_g.toarray(), expected_g.toarray())
+
+    computing.pattern.cache_clear()
+    assert computing.pattern.cache_info().currsize == 0
@@ -0,0 +1,48 @@
+import badcrossbar
+import badcrossbar.parallel
+import numpy as np
+import pytest
+from tests.test_compute import compare_solutions
+
+rng = np.random.default_rng(0)
+jobs = [
+    (rng.uniform(-1, 1, (5, 3)), rng.uniform(100, 1000, (5, 4)), 0.5),
+    (rng.uniform(-1, 1, (2, 1)), rng.uniform(100, 1000, (2, 6)), None, 1, 0),
+    {
+        "applied_voltages": rng.uniform(-1, 1, (4, 2)),
+        "resistances": rng.uniform(100, 1000, (4, 4)),
+        "r_i": 2,
+        "all_currents": False,
+    },
+    {
+        "applied_voltages": rng.uniform(-1, 1, (3, 2)),
+        "resistances": rng.uniform(100, 1000, (3, 3)),
+        "r_i": np.inf,
+        "node_voltages": False,
+    },
+]
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_imap(chunksize):
+    """Tests that `badcrossbar.parallel.imap()` agrees with
+    `badcrossbar.compute()`."""
+    solutions = list(badcrossbar.parallel.imap(jobs, workers=2, chunksize=chunksize))
+    assert len(solutions) == len(jobs)
+    for job, computed_solution in zip(jobs, solutions):
+        if isinstance(job, dict):
+            expected_solution = badcrossbar.compute(**job)
+        else:
+            expected_solution = badcrossbar.compute(*job)
+        compare_solutions(computed_solution, expected_solution)
+
+
+def test_imap_dtype():
+    """Tests that `badcrossbar.parallel.imap()` returns arrays of the
+    requested type."""
+    job = dict(zip(["applied_voltages", "resistances", "r_i"], jobs[0]), dtype=np.float32)
+    (computed_solution,) = badcrossbar.parallel.imap([job], workers=1)
+    expected_solution = badcrossbar.compute(**job)
+    compare_solutions(computed_solution, expected_solution, rtol=0, atol=0)
+    for field in computed_solution.currents + computed_solution.voltages:
+        assert field.dtype == np.float32
@@ -0,0 +1,166 @@
+from collections import namedtuple
+
+import badcrossbar
+import badcrossbar.computing as computing
+import numpy as np
+import pytest
+
+Interconnect = namedtuple("Interconnect", ["word_line", "bit_line"])
+
+rng = np.random.default_rng(0)
+resistances_list = [
+    rng.uniform(1e3, 1e4, (1, 1)),
+    rng.uniform(1e3, 1e4, (1, 6)),
+    rng.uniform(1e3, 1e4, (6, 1)),
+    rng.uniform(1e3, 1e4, (8, 5)),
+]
+applied_voltages_list = [
+    rng.uniform(-1, 1, (resistances.shape[0], 3)) for resistances in resistances_list
+]
+r_i_list = [Interconnect(0.5, 0.25), Interconnect(10, 0), Interconnect(0, 10)]
+
+solver_inputs = [
+    (resistances, applied_voltages, r_i, solver, preconditioner)
+    for resistances, applied_voltages in zip(resistances_list, applied_voltages_list)
+    for r_i in r_i_list
+    for solver, preconditioner in [
+        ("cg", None),
+        ("cg", "jacobi"),
+        ("cg", "ilu"),
+        ("cg", "line"),
+        ("minres", None),
+        ("minres", "jacobi"),
+        ("minres", "line"),
+    ]
+]
+
+
+@pytest.mark.parametrize("resistances,applied_voltages,r_i,solver,preconditioner", solver_inputs)
+def test_v_iterative(resistances, applied_voltages, r_i, solver, preconditioner):
+    """Tests that iterative solvers in `badcrossbar.computing.solve.v()` agree
+    with the direct solver."""
+    expected_v = computing.solve.v(resistances, r_i, applied_voltages)
+    computed_v = computing.solve.v(
+        resistances, r_i, applied_voltages, solver=solver, preconditioner=preconditioner, tol=1e-12
+    )
+    np.testing.assert_allclose(computed_v, expected_v, rtol=1e-6, atol=1e-9)
+
+
+schur_inputs = [
+    (resistances, applied_voltages, r_i)
+    for resistances, applied_voltages in zip(resistances_list, applied_voltages_list)
+    for r_i in [Interconnect(0.5, 0.25), Interconnect(10, 20), Interconnect(10, 0)]
+]
+
+
+@pytest.mark.parametrize("resistances,applied_voltages,r_i", schur_inputs)
+def test_v_schur(resistances, applied_voltages, r_i):
+    """Tests that Schur complement solver in `badcrossbar.computing.solve.v()`
+    agrees with the direct solver."""
+    expected_v = computing.solve.v(resistances, r_i, applied_voltages)
+    computed_v = computing.solve.v(resistances, r_i, applied_voltages, solver="schur", tol=1e-12)
+    np.testing.assert_allclose(computed_v, expected_v, rtol=1e-6, atol=1e-9)
+
+
+def test_crossbar_iterative_info():
+    """Tests that `badcrossbar.Crossbar` reports statistics of the iterative
+    solver."""
+    crossbar = badcrossbar.Crossbar(resistances_list[-1], 0.5, solver="cg", tol=1e-12)
+    assert crossbar.info is None
+    crossbar.apply(applied_voltages_list[-1])
+    assert crossbar.info.iterations.shape == (applied_voltages_list[-1].shape[1],)
+    assert (crossbar.info.iterations > 0).all()
+    assert (crossbar.info.residuals < 1e-11).all()
+
+
+@pytest.mark.parametrize("solver", ["cg", "minres", "schur"])
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"lazy": True}, {"all_currents": False, "node_voltages": False}, {"memory_limit": 1}],
+)
+def test_compute_iterative_info(solver, kwargs):
+    """Tests that `badcrossbar.compute()` reports statistics of the
+    iterative solver in the returned solution."""
+    resistances, applied_voltages = resistances_list[-1], applied_voltages_list[-1]
+    solution = badcrossbar.compute(applied_voltages, resistances, 0.5, solver=solver, **kwargs)
+    assert isinstance(solution.info, computing.iterative.SolverInfo)
+    assert solution.info.iterations.shape == (applied_voltages.shape[1],)
+    assert (solution.info.iterations > 0).all()
+
+    assert badcrossbar.compute(applied_voltages, resistances, 0.5, **kwargs).info is None
+
+
+def test_line_preconditioner_iterations():
+    """Tests that line preconditioner converges faster than Jacobi
+    preconditioner when interconnect resistance is high."""
+    resistances = rng.uniform(1e2, 1e3, (16, 16))
+    applied_voltages = rng.uniform(-1, 1, (16, 2))
+    iterations = {}
+    for preconditioner in ["jacobi", "line"]:
+        crossbar = badcrossbar.Crossbar(resistances, 10, solver="cg", preconditioner=preconditioner)
+        crossbar.apply(applied_voltages)
+        iterations[preconditioner] = crossbar.info.iterations.max()
+    assert iterations["line"] < iterations["jacobi"]
+
+
+@pytest.mark.parametrize("num_lines,size,num_examples", [(1, 1, 1), (3, 1, 2), (4, 7, 3)])
+def test_tridiagonal_solve(num_lines, size, num_examples):
+    """Tests `badcrossbar.computing.tridiagonal.solve()`."""
+    lower = rng.uniform(-1, 0, (num_lines, size - 1))
+    upper = rng.uniform(-1, 0, (num_lines, size - 1))
+    diagonal = rng.uniform(2, 3, (num_lines, size))
+    rhs = rng.uniform(-1, 1, (num_lines, size, num_examples))
+
+    factorization = computing.tridiagonal.factorize(lower, diagonal, upper)
+    x = computing.tridiagonal.solve(factorization, rhs)
+
+    for line in range(num_lines):
+        matrix = np.diag(diagonal[line]) + np.diag(lower[line], -1) + np.diag(upper[line], 1)
+        np.testing.assert_array_almost_equal(matrix @ x[line], rhs[line])
+
+
+half_system_inputs = [
+    (resistances, applied_voltages, r_i)
+    for resistances, applied_voltages in zip(resistances_list, applied_voltages_list)
+    for r_i in [Interconnect(10, 0), Interconnect(0, 10)]
+]
+
+
+@pytest.mark.parametrize("resistances,applied_voltages,r_i", half_system_inputs)
+def test_factorize_lines(resistances, applied_voltages, r_i):
+    """Tests that `badcrossbar.computing.solve.factorize()` solves the
+    systems of independent lines exactly when one of the interconnect
+    resistances is zero."""
+    g = computing.fill.g(resistances, r_i)
+    i = computing.fill.i(applied_voltages, resistances, r_i)
+    expected_v = np.linalg.solve(g.toarray(), i)
+    computed_v = computing.solve.factorize(resistances, r_i)(i)
+    np.testing.assert_allclose(computed_v, expected_v, rtol=1e-10)
+
+
+block_inputs = [
+    (resistances, applied_voltages, r_i, solver)
+    for resistances, applied_voltages in zip(resistances_list, applied_voltages_list)
+    for r_i in [Interconnect(0.5, 0.5), Interconnect(10, 0), Interconnect(0, 10)]
+    for solver in ["direct", "schur"]
+]
+
+
+@pytest.mark.parametrize("resistances,applied_voltages,r_i,solver", block_inputs)
+def test_v_blocks(resistances, applied_voltages, r_i, solver):
+    """Tests that solving for blocks of examples in multiple threads gives the
+    same result as solving for all of them at once."""
+    expected_v = computing.solve.v(resistances, r_i, applied_voltages)
+    computed_v = computing.solve.v(
+        resistances, r_i, applied_voltages, solver=solver, tol=1e-12, block_size=2, workers=2
+    )
+    np.testing.assert_allclose(computed_v, expected_v, rtol=1e-6, atol=1e-9)
+
+
+def test_crossbar_blocks_info():
+    """Tests that statistics of the iterative solver cover all blocks of
+    examples."""
+    applied_voltages = applied_voltages_list[-1]
+    crossbar = badcrossbar.Crossbar(resistances_list[-1], 0.5, solver="cg")
+    crossbar.apply(applied_voltages, block_size=1, workers=2)
+    assert crossbar.info.iterations.shape == (applied_voltages.shape[1],)
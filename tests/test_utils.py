@@ -0,0 +1,52 @@
+import badcrossbar
+import numpy as np
+import pytest
+from badcrossbar import utils
+from tests.test_compute import compare_solutions
+
+
+@pytest.mark.parametrize("num_examples", [1, 4])
+@pytest.mark.parametrize("compress", [False, True])
+def test_save_solution(num_examples, compress, tmp_path):
+    """Tests that solutions are saved to and loaded from a binary result
+    store.
+
+    Parameters
+    ----------
+    num_examples : int
+        Number of sets of applied voltages.
+    compress : bool
+        Whether the arrays are compressed.
+    tmp_path : pathlib.Path
+        Temporary directory.
+    """
+    rng = np.random.default_rng(0)
+    resistances = rng.uniform(100, 1000, (3, 5))
+    applied_voltages = rng.uniform(-1, 1, (3, num_examples))
+    solutions = [
+        badcrossbar.compute(applied_voltages, resistances, 0.5),
+        # node voltages of insulating interconnects are `Voltages(None, None)`.
+        badcrossbar.compute(applied_voltages, resistances, np.inf),
+        badcrossbar.compute(applied_voltages, resistances, 0.5, node_voltages=False),
+    ]
+
+    path = str(tmp_path / "results")
+    for solution in solutions:
+        stored_path = utils.save_solution(solution, path, compress=compress, append=True)
+    assert utils.num_stored_solutions(stored_path) == 3
+
+    for index, solution in enumerate(solutions):
+        compare_solutions(utils.load_solution(stored_path, index), solution, rtol=0, atol=0)
+
+    # partial loading of examples.
+    for examples in [slice(1, 3), slice(None, None, 2), slice(-1, None)]:
+        loaded_solution = utils.load_solution(stored_path, -1, examples=examples)
+        expected_output = solutions[-1].currents.output[examples]
+        np.testing.assert_array_equal(loaded_solution.currents.output, expected_output)
+        expected_device = np.atleast_3d(solutions[-1].currents.device)[..., examples]
+        np.testing.assert_array_equal(
+            loaded_solution.currents.device, utils.squeeze_third_axis(expected_device)
+        )
+
+    with pytest.raises(IndexError):
+        utils.load_solution(stored_path, 3)